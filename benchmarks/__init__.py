@@ -0,0 +1 @@
+"""WorkWay benchmarks."""
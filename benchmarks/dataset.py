@@ -0,0 +1,333 @@
+"""Deterministic synthetic WorkWay database for load tests.
+
+Works are shifts of several independent schedules (streams) with 2/2
+and 5/2 patterns, night shifts cross day and month boundaries. Some
+shifts are longer than rate hours and have rework, some have bonuses
+and other income. The same seed always gives the same database.
+Run from the project root:
+
+    python -m benchmarks.dataset work.db --works 1000000 --seed 1
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterator
+
+from workway.core.db import DataBase
+from workway.core.db.migrations import create_datetime_indexes
+from workway.core.db.migrations import create_relation_indexes
+from workway.core.db.migrations import create_work_month
+from workway.core.db.profiles import DEFAULT_PROFILE
+from workway.core.subcores.recalculation import WorkerBonus
+from workway.core.subcores.recalculation import WorkerRate
+from workway.core.subcores.recalculation import calculate_values
+from workway.money import to_cents
+
+
+# Average count of shifts of one stream in a year for 2/2 and 5/2
+SHIFTS_IN_YEAR = 180
+
+
+@dataclass(frozen=True, slots=True)
+class Pattern:
+    """Shift pattern: work days, days off and shift start and length."""
+
+    name: str
+    work_days: int
+    days_off: int
+    start_hour: int
+    hours: int
+
+
+PATTERNS = (
+    Pattern("2/2 day", 2, 2, 8, 12),
+    Pattern("2/2 night", 2, 2, 20, 12),
+    Pattern("5/2", 5, 2, 9, 9),
+)
+
+RATES = (
+    # name, value, hours
+    ("Дневная смена", 2500, 12),
+    ("Ночная смена", 3200, 12),
+    ("Пятидневка", 2100, 9),
+    ("Старая ставка", 1800, 12),
+)
+
+BONUSES = (
+    # name, value, type
+    ("Ночные", 20, "percent"),
+    ("Стаж", 10, "percent"),
+    ("Праздничные", 100, "percent"),
+    ("Премия", 500, "fix"),
+    ("Наставник", 300, "fix"),
+)
+
+OTHER_INCOME = ("Чаевые", "Подработка", "Компенсация", "Такси")
+
+# Count of prepared bonus combinations of works
+BONUS_SETS = 64
+
+# Dropped while works are inserted and created again by migrations
+BULK_DROPPED = (
+    "TRIGGER work_month_insert",
+    "TRIGGER work_month_delete",
+    "TRIGGER work_month_update",
+    "INDEX work_start_datetime_idx",
+    "INDEX work_end_datetime_idx",
+    "INDEX work_rate_id_idx",
+    "INDEX work_bonus_work_id_idx",
+    "INDEX work_bonus_bonus_id_idx",
+)
+
+
+@dataclass
+class Dataset:
+    """Settings of generated database."""
+
+    works: int = 10_000
+    start: datetime = datetime(2000, 1, 1)
+    years: int = 5
+    seed: int = 0
+    rework_share: float = 0.15
+    bonus_share: float = 0.4
+    other_income_share: float = 0.05
+    chunk_size: int = 50_000
+
+    @property
+    def streams(self) -> int:
+        """Count of schedules which give enough works for years."""
+        return max(1, math.ceil(self.works / (self.years * SHIFTS_IN_YEAR)))
+
+
+def iter_shifts(
+    dataset: Dataset,
+    rng: random.Random,
+) -> Iterator[tuple[int, datetime, datetime]]:
+    """Iterate pattern index, start and end of shifts ordered by start.
+
+    Each stream has own pattern and phase, start time has a jitter.
+    """
+    end = dataset.start + timedelta(days=366 * dataset.years)
+    streams = []
+    for _ in range(dataset.streams):
+        pattern_index = rng.randrange(len(PATTERNS))
+        pattern = PATTERNS[pattern_index]
+        cycle = pattern.work_days + pattern.days_off
+        streams.append((pattern_index, pattern, cycle, rng.randrange(cycle)))
+
+    day = dataset.start
+    while day < end:
+        for pattern_index, pattern, cycle, phase in streams:
+            if ((day - dataset.start).days + phase) % cycle >= (
+                pattern.work_days
+            ):
+                continue
+            start = day + timedelta(
+                hours=pattern.start_hour,
+                minutes=rng.choice((-30, -15, 0, 0, 0, 15)),
+            )
+            yield pattern_index, start, start + timedelta(hours=pattern.hours)
+        day += timedelta(days=1)
+
+
+def generate(path: Path, dataset: Dataset) -> int:
+    """Fill new db with synthetic data, return count of works.
+
+    Triggers and indexes of works are dropped during inserts, Work_Month
+    and indexes are built once at the end.
+    """
+    rng = random.Random(dataset.seed)
+    db = DataBase(str(path), use_datacls=True, profile="fast")
+
+    rates = []
+    with db.batch():
+        for name in BULK_DROPPED:
+            db.execute(f"DROP {name}")
+        for name, value, hours in RATES:
+            rate = {
+                "name": name,
+                "value": to_cents(value),
+                "by_default": int(not rates),
+                "type": "shift",
+                "hours": hours,
+                "state": 1 if len(rates) < 3 else 2,
+            }
+            rate["id"] = db.rate.add(rate)
+            rates.append(WorkerRate(
+                rate["id"],
+                name,
+                "shift",
+                rate["value"],
+                hours,
+            ))
+        bonuses = []
+        for name, value, type_ in BONUSES:
+            bonus = {
+                "name": name,
+                "value": to_cents(value),
+                "by_default": 0,
+                "type": type_,
+                "state": 1,
+            }
+            bonuses.append(WorkerBonus(
+                db.bonus.add(bonus),
+                name,
+                type_,
+                bonus["value"],
+            ))
+
+    # works pick prepared variants, it is cheaper than sampling each time
+    bonus_sets = [
+        [
+            {
+                "bonus": bonus,
+                "on_full_sum": bonus.type == "percent" and rng.random() < 0.5,
+            }
+            for bonus in rng.sample(bonuses, rng.randint(1, 3))
+        ]
+        for _ in range(BONUS_SETS)
+    ]
+    rework_variants = [
+        *(
+            {"type": "percent", "value": to_cents(percent)}
+            for percent in (50, 100, 150) for _ in range(7)
+        ),
+        *(
+            {"type": "fix", "value": to_cents(value)}
+            for value in range(500, 3000, 300)
+        ),
+    ]
+    extra_hours = [timedelta(hours=hours) for hours in range(1, 5)]
+
+    shifts = iter_shifts(dataset, rng)
+    count = 0
+    rework_id = 0
+    while count < dataset.works:
+        works = []
+        reworks = []
+        work_bonuses = []
+        work_income = []
+        items = []
+        for pattern_index, start, end in shifts:
+            count += 1
+            work_id = count
+            # old works use deleted rate
+            rate = rates[3 if start.year < dataset.start.year + 1 else
+                         min(pattern_index, 2)]
+
+            rework = None
+            if rng.random() < dataset.rework_share:
+                end += rng.choice(extra_hours)
+                rework_id += 1
+                rework = rng.choice(rework_variants)
+                reworks.append((rework_id, rework["value"], rework["type"]))
+
+            bonuses_of_work = []
+            if rng.random() < dataset.bonus_share:
+                bonuses_of_work = rng.choice(bonus_sets)
+                work_bonuses.extend(
+                    (work_id, bonus["bonus"].id, bonus["on_full_sum"])
+                    for bonus in bonuses_of_work
+                )
+
+            other_income = []
+            if rng.random() < dataset.other_income_share:
+                other_income = [
+                    {
+                        "name": rng.choice(OTHER_INCOME),
+                        "value": to_cents(rng.randrange(100, 5000, 50)),
+                    }
+                    for _ in range(rng.randint(1, 2))
+                ]
+                work_income.extend(
+                    (work_id, position, income["name"], income["value"])
+                    for position, income in enumerate(other_income)
+                )
+
+            works.append([
+                work_id,
+                f"Смена {work_id}",
+                str(start),
+                str(end),
+                rate.id,
+                rework_id if rework else None,
+            ])
+            items.append((
+                rate,
+                bonuses_of_work,
+                int((end - start).total_seconds()),
+                rework,
+                sum(income["value"] for income in other_income),
+            ))
+            if len(works) == dataset.chunk_size or count == dataset.works:
+                break
+        if not works:
+            break
+
+        for work, value in zip(works, calculate_values(items)):
+            work.append(value)
+        with db.batch():
+            db.execute(
+                "INSERT INTO Rework (id, value, type) VALUES (?, ?, ?)",
+                reworks,
+                many=True,
+            )
+            db.execute(
+                "INSERT INTO Work (id, name, start_datetime, end_datetime, "
+                "rate_id, rework_id, value, json, hours, state, description) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, '{}', 0, 1, '')",
+                works,
+                many=True,
+            )
+            db.execute(
+                "INSERT INTO Work_Bonus (work_id, bonus_id, on_full_sum) "
+                "VALUES (?, ?, ?)",
+                work_bonuses,
+                many=True,
+            )
+            db.execute(
+                "INSERT INTO Other_Income (work_id, position, name, value) "
+                "VALUES (?, ?, ?, ?)",
+                work_income,
+                many=True,
+            )
+
+    with db.batch():
+        create_datetime_indexes(db)
+        create_relation_indexes(db)
+        create_work_month(db)
+    # db file is complete without WAL for any profile
+    db.apply_profile(DEFAULT_PROFILE)
+    db.close()
+    DataBase._instances.pop(str(path), None)  # type: ignore
+    return count
+
+
+def main() -> None:
+    """Generate db."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--works", type=int, default=Dataset.works)
+    parser.add_argument("--years", type=int, default=Dataset.years)
+    parser.add_argument("--seed", type=int, default=Dataset.seed)
+    args = parser.parse_args()
+
+    if args.path.exists():
+        parser.error(f"{args.path} already exists")
+    begin = time.perf_counter()
+    works = generate(
+        args.path,
+        Dataset(works=args.works, years=args.years, seed=args.seed),
+    )
+    print(f"{works} works in {time.perf_counter() - begin:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Save and month-load latency under every db performance profile.
+
+Run from the project root:
+
+    python -m benchmarks.profiles --works 500 --loads 200
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from workway.core import Core
+from workway.core.db.profiles import PROFILES
+from workway.money import to_cents
+
+
+def _ms(timings: list[float]) -> str:
+    """Format mean and p95 of timings in milliseconds."""
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    return "{:8.3f} {:8.3f}".format(
+        statistics.mean(timings) * 1000,
+        p95 * 1000,
+    )
+
+
+def run_profile(name: str, path: Path, works: int, loads: int) -> str:
+    """Measure one profile on new db."""
+    Core._instance = None
+    core = Core(path)
+    db = core.db
+    db.apply_profile(name)
+    money = core.money
+    main = core.main
+    rate = money.add_rate({
+        "name": "rate",
+        "value": 2500,
+        "by_default": 1,
+        "hours": 8,
+        "type": "shift",
+    })
+    bonus = money.add_bonus({
+        "name": "bonus",
+        "value": 10,
+        "type": "percent",
+        "by_default": 0,
+    })
+
+    save_timings = []
+    start = datetime(2020, 1, 1, 8)
+    for day in range(works):
+        start_datetime = start + timedelta(days=day)
+        begin = time.perf_counter()
+        main.work_maker.save_work(
+            rate,
+            [{"bonus": bonus, "on_full_sum": False}],
+            start_datetime,
+            start_datetime + timedelta(hours=12),
+            name=f"work {day}",
+            rework={"value": to_cents(50), "type": "percent"},
+        )
+        save_timings.append(time.perf_counter() - begin)
+
+    months = sorted({
+        ((start + timedelta(days=day)).strftime("%m"),
+         (start + timedelta(days=day)).strftime("%Y"))
+        for day in range(works)
+    })
+    load_timings = []
+    for index in range(loads):
+        month, year = months[index % len(months)]
+        # every load reads db, not cached month
+        core.month_cache.clear()
+        begin = time.perf_counter()
+        main.get_works(month, year)
+        load_timings.append(time.perf_counter() - begin)
+
+    db.close()
+    return f"{name:<10} {_ms(save_timings)} {_ms(load_timings)}"
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--works", type=int, default=500)
+    parser.add_argument("--loads", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'save ms mean/p95':>17} "
+          f"{'load ms mean/p95':>17}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in PROFILES:
+            path = Path(directory) / f"{name}.db"
+            print(run_profile(name, path, args.works, args.loads))
+
+
+if __name__ == "__main__":
+    main()
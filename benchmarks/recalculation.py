@@ -0,0 +1,123 @@
+"""Scaling of works recalculation from one to many processes.
+
+Run from the project root:
+
+    python -m benchmarks.recalculation --works 50000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+from workway.core import Core
+from workway.core.db import DataBase
+from workway.core.subcores import Money
+from workway.money import to_cents
+
+
+def fill_db(db: DataBase, money: Money, works: int) -> list[int]:
+    """Add rates, bonuses and works with zero value, return rate ids."""
+    rates = [
+        money.add_rate({
+            "name": f"rate {index}",
+            "value": 2500 + index * 100,
+            "by_default": 0,
+            "hours": 8,
+            "type": "shift",
+        })
+        for index in range(4)
+    ]
+    bonuses = [
+        money.add_bonus({
+            "name": "percent",
+            "value": 10,
+            "type": "percent",
+            "by_default": 0,
+        }),
+        money.add_bonus({
+            "name": "fix",
+            "value": 300,
+            "type": "fix",
+            "by_default": 0,
+        }),
+    ]
+    start = datetime(2000, 1, 1, 8)
+    with db.batch():
+        rework_id = db.rework.add({"value": to_cents(50), "type": "percent"})
+        db.execute(
+            "INSERT INTO Work (id, name, start_datetime, end_datetime, "
+            "hours, rate_id, rework_id, value, json, state, description) "
+            "VALUES (?, ?, ?, ?, 0, ?, ?, 0, '{}', 1, '')",
+            [
+                (
+                    index,
+                    f"work {index}",
+                    str(start + timedelta(hours=13 * index)),
+                    str(start + timedelta(hours=13 * index + 8 + index % 5)),
+                    rates[index % len(rates)].id,
+                    rework_id if index % 3 else None,
+                )
+                for index in range(1, works + 1)
+            ],
+            many=True,
+        )
+        db.execute(
+            "INSERT INTO Work_Bonus (work_id, bonus_id, on_full_sum) "
+            "VALUES (?, ?, ?)",
+            [
+                (index, bonuses[index % 2].id, index % 4 == 0)
+                for index in range(1, works + 1)
+            ],
+            many=True,
+        )
+        db.execute(
+            "INSERT INTO Other_Income (work_id, position, name, value) "
+            "VALUES (?, 0, 'tips', ?)",
+            [
+                (index, to_cents(150))
+                for index in range(7, works + 1, 7)
+            ],
+            many=True,
+        )
+    return [rate.id for rate in rates]
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--works", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "work.db"
+        core = Core(path)
+        db = core.db
+        db.apply_profile("fast")
+        money = core.money
+        rate_ids = fill_db(db, money, args.works)
+        # first run saves values, so every measured run changes all works
+        money.recalculate_works(rate_ids, workers=1)
+
+        print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+        single = None
+        for workers in range(1, args.workers + 1):
+            for rate in db.rate.select():
+                rate.value += 1
+                rate.change()
+            begin = time.perf_counter()
+            changed = money.recalculate_works(rate_ids, workers=workers)
+            elapsed = time.perf_counter() - begin
+            single = single or elapsed
+            print(f"{workers:>7} {elapsed:>8.3f} {single / elapsed:>8.2f}")
+            assert changed == args.works, changed
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Cold and warm start time of Core.
+
+Cold start creates new db, warm start opens existing one. Run from the
+project root:
+
+    python -m benchmarks.startup --repeat 20
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from workway.core import Core
+from workway.core.db import DataBase
+
+
+def start_core(path: Path) -> float:
+    """Construct Core with clean singletons and return its time."""
+    Core._instance = None
+    DataBase._instances.clear()  # type: ignore
+    begin = time.perf_counter()
+    core = Core(path)
+    elapsed = time.perf_counter() - begin
+    core.db.close()
+    return elapsed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cold = []
+    warm = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(args.repeat):
+            path = Path(directory) / f"work_{index}.db"
+            cold.append(start_core(path))
+            warm.append(start_core(path))
+
+    for name, timings in (("cold", cold), ("warm", warm)):
+        print("{} Core(): mean {:.3f} ms, median {:.3f} ms".format(
+            name,
+            statistics.mean(timings) * 1000,
+            statistics.median(timings) * 1000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
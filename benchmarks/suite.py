@@ -0,0 +1,246 @@
+"""Hot paths of core on generated databases of several sizes.
+
+Results are written like JSON and can be compared with stored baseline.
+Run from the project root:
+
+    python -m benchmarks.suite --sizes 10000 100000 --output new.json
+    python -m benchmarks.suite --sizes 10000 --compare new.json
+
+Generated databases are kept in --data-dir, so the same data is used by
+baseline and compared runs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from datetime import timedelta
+from itertools import count
+from itertools import cycle
+from pathlib import Path
+from typing import Callable
+
+from workway.core import Core
+from workway.core.db import DataBase
+from workway.core.subcores.work import Сalculation
+from workway.money import to_cents
+
+from .dataset import Dataset
+from .dataset import generate
+
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def measure(func: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Call function several times and return timings in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - begin) * 1000)
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "p95": timings[max(int(len(timings) * 0.95) - 1, 0)],
+        "min": timings[0],
+        "repeat": repeat,
+    }
+
+
+def start_core(path: Path) -> Core:
+    """Construct Core with clean singletons."""
+    Core._instance = None
+    DataBase._instances.clear()  # type: ignore
+    return Core(path)
+
+
+def run_size(path: Path, repeat: int) -> dict[str, dict[str, float]]:
+    """Measure all hot paths on one db."""
+    rng = random.Random(0)
+    core = start_core(path)
+    main = core.main
+    work_maker = main.work_maker
+    years = list(main._get_work_years())
+    months = [
+        (month, year)
+        for year in years
+        for month in main._get_work_month_by_year(year)
+    ]
+    results = {}
+
+    def get_works() -> None:
+        core.month_cache.clear()
+        main.get_works(*rng.choice(months))
+
+    results["get_works"] = measure(get_works, repeat)
+    results["get_works_cached"] = measure(
+        lambda: main.get_works(*months[0]),
+        repeat,
+    )
+    results["filters_data"] = measure(
+        lambda: main.filters_data(rng.choice(years)),
+        repeat,
+    )
+    results["all_rate"] = measure(core.money.all_rate, repeat)
+
+    works = main.get_works(*months[len(months) // 2])
+
+    def from_work() -> None:
+        core.calculation_cache.clear()
+        for work in works:
+            Сalculation.from_work(work_maker, work)
+
+    results["from_work_month"] = measure(from_work, repeat)
+    core.db.close()
+
+    # writes change db, so they run on copy and generated db stays
+    # the same for baseline and compared runs
+    write_path = path.with_name(f"{path.stem}_write.db")
+    shutil.copyfile(path, write_path)
+    core = start_core(write_path)
+    main = core.main
+    work_maker = main.work_maker
+    rate = core.money.all_rate()[0]
+    bonuses = [
+        {"bonus": bonus, "on_full_sum": False}
+        for bonus in core.money.all_bonus()
+    ]
+    start = datetime(1990, 1, 1, 8)
+    days = count()
+
+    def save_work() -> None:
+        start_datetime = start + timedelta(days=next(days))
+        work_maker.save_work(
+            rate,
+            bonuses,
+            start_datetime,
+            start_datetime + timedelta(hours=12),
+            name="benchmark",
+            rework={"value": to_cents(50), "type": "percent"},
+        )
+
+    results["save_work"] = measure(save_work, repeat)
+    saved_works = cycle(main.db.work.select(name="benchmark"))
+
+    def update_work() -> None:
+        work = next(saved_works)
+        work_maker.update_work(
+            work,
+            rate,
+            bonuses,
+            work.start_dttm,
+            work.end_dttm + timedelta(hours=1),
+            name="benchmark",
+            rework={"value": to_cents(25), "type": "percent"},
+        )
+
+    results["update_work"] = measure(update_work, repeat)
+    core.db.close()
+    for suffix in ("", "-wal", "-shm"):
+        write_path.with_name(write_path.name + suffix).unlink(missing_ok=True)
+
+    def cold_core() -> None:
+        start_core(path).db.close()
+
+    results["cold_core"] = measure(cold_core, repeat)
+    return results
+
+
+def compare(
+    baseline: dict,
+    results: dict,
+    threshold: float,
+) -> bool:
+    """Print median ratio of results to baseline, return True if slower."""
+    regressed = False
+    print(f"{'size':>9} {'case':<16} {'base ms':>9} {'new ms':>9} "
+          f"{'ratio':>6}")
+    for size, cases in results["results"].items():
+        base_cases = baseline["results"].get(size, {})
+        for case, timings in cases.items():
+            if case not in base_cases:
+                continue
+            base = base_cases[case]["median"]
+            new = timings["median"]
+            ratio = new / base if base else float("inf")
+            mark = ""
+            if ratio > 1 + threshold:
+                regressed = True
+                mark = " slower"
+            print(f"{size:>9} {case:<16} {base:>9.3f} {new:>9.3f} "
+                  f"{ratio:>6.2f}{mark}")
+    return regressed
+
+
+def main() -> None:
+    """Run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "workway_benchmarks",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="baseline json")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown of median, 0.1 is 10%%",
+    )
+    args = parser.parse_args()
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    results: dict = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        path = args.data_dir / f"works_{size}.db"
+        if not path.exists():
+            begin = time.perf_counter()
+            # interrupted generation must not leave db for next runs
+            temp_path = path.with_suffix(".tmp")
+            temp_path.unlink(missing_ok=True)
+            generate(temp_path, Dataset(works=size))
+            temp_path.rename(path)
+            print(f"generated {path} in {time.perf_counter() - begin:.1f} s")
+        results["results"][str(size)] = run_size(path, args.repeat)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    elif not args.compare:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
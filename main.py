@@ -1,6 +1,7 @@
 #from flet import app
 
-from workway.main import app  # noqa: F401
+from workway.main import run
 
 
-#app(main)
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+"""Common fixtures of tests."""
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Iterator
+
+import pytest
+
+from workway.core import Core
+from workway.core.db import DataBase
+
+
+if TYPE_CHECKING:
+    from workway.core.db.tables import RateRow
+
+
+def start_core(path: Path) -> Core:
+    """Construct Core with clean singletons."""
+    Core._instance = None
+    DataBase._instances.clear()  # type: ignore
+    return Core(path)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    """Return path of new db file."""
+    return tmp_path / "work.db"
+
+
+@pytest.fixture
+def core(db_path: Path) -> Iterator[Core]:
+    """Return Core with new db."""
+    core = start_core(db_path)
+    yield core
+    core.db.close()
+    Core._instance = None
+    DataBase._instances.clear()  # type: ignore
+
+
+@pytest.fixture
+def db(core: Core) -> DataBase:
+    """Return db of core."""
+    return core.db
+
+
+@pytest.fixture
+def rate(core: Core) -> "RateRow":
+    """Return shift rate 1000 for 8 hours."""
+    return core.money.add_rate({
+        "name": "Смена",
+        "value": "1000",
+        "by_default": 1,
+        "hours": 8,
+        "type": "shift",
+    })
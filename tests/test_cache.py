@@ -0,0 +1,187 @@
+"""Tests of caches of core and their invalidation."""
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from workway.core import Core
+from workway.core.db.tables import BonusRow
+from workway.core.db.tables import RateRow
+from workway.core.subcores.work import Сalculation
+
+from .conftest import start_core
+
+
+def add_bonus(core: Core, name: str = "Премия") -> BonusRow:
+    return core.money.add_bonus({
+        "name": name,
+        "value": "500",
+        "by_default": 0,
+        "type": "fix",
+    })
+
+
+def test_catalog_selects_rates_once(core: Core, rate: RateRow) -> None:
+    core.money.all_rate()
+    misses = core.catalog.misses
+
+    assert core.money.all_rate() == [rate]
+    assert core.money.all_rate() is not core.money.all_rate()
+    assert core.catalog.misses == misses
+
+
+def test_catalog_follows_rate_changes(core: Core, rate: RateRow) -> None:
+    assert [item.name for item in core.money.all_rate()] == ["Смена"]
+
+    other = core.money.add_rate({
+        "name": "Ночь",
+        "value": "1500",
+        "by_default": 0,
+        "hours": 12,
+        "type": "shift",
+    })
+    assert [item.name for item in core.money.all_rate()] == [
+        "Смена",
+        "Ночь",
+    ]
+
+    core.money.update_item(
+        {
+            "name": "День",
+            "value": "1000",
+            "by_default": 1,
+            "hours": 8,
+            "type": "shift",
+        },
+        rate,
+    )
+    assert [item.name for item in core.money.all_rate()] == ["День", "Ночь"]
+
+    new = core.money.replace_rate(
+        {
+            "name": "Ночь",
+            "value": "2000",
+            "by_default": 0,
+            "hours": 12,
+            "type": "shift",
+        },
+        other,
+    )
+    assert [item.id for item in core.money.all_rate()] == [rate.id, new.id]
+
+    core.money.delete_rate(rate.id)
+    assert [item.id for item in core.money.all_rate()] == [new.id]
+
+
+def test_catalog_follows_bonus_changes(core: Core) -> None:
+    bonus = add_bonus(core)
+    assert [item.name for item in core.money.all_bonus()] == ["Премия"]
+
+    core.money.update_bonus(
+        {
+            "name": "Большая премия",
+            "value": "500",
+            "type": "fix",
+            "by_default": 0,
+        },
+        bonus,
+    )
+    assert [item.name for item in core.money.all_bonus()] == [
+        "Большая премия",
+    ]
+
+    new = core.money.replace_bonus(
+        {"name": "Премия", "value": "700", "type": "fix", "by_default": 0},
+        bonus,
+    )
+    assert [item.id for item in core.money.all_bonus()] == [new.id]
+
+    core.money.delete_bonus(new.id)
+    assert core.money.all_bonus() == []
+
+
+def test_bonus_tile_deletes_through_money(
+    core: Core,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    flet = pytest.importorskip("flet")
+    from workway.gui.pages.money.tiles import BonusTile
+
+    bonus = add_bonus(core)
+    assert [item.id for item in core.main.work_maker.get_bonuses()] == [
+        bonus.id,
+    ]
+    tile = BonusTile(core.money, bonus)
+    column = flet.Column([tile])
+    tile.parent = column
+    monkeypatch.setattr(flet.Column, "update", lambda self: None)
+
+    tile.delete(None)
+    assert column.controls == []
+    assert core.main.work_maker.get_bonuses() == []
+
+
+def save_work(core: Core, rate: RateRow, bonus: BonusRow) -> None:
+    start = datetime(2024, 1, 1, 8)
+    core.main.work_maker.save_work(
+        rate,
+        [{"bonus": bonus, "on_full_sum": False}],
+        start,
+        start + timedelta(hours=12),
+    )
+
+
+def test_calculation_cache_hits_same_work(core: Core, rate: RateRow) -> None:
+    bonus = add_bonus(core)
+    save_work(core, rate, bonus)
+    work = core.main.get_works("01", "2024")[0]
+    cache = core.calculation_cache
+    hits = cache.hits
+
+    calculation = Сalculation.from_work(core.main.work_maker, work)
+
+    assert cache.hits == hits + 1
+    assert calculation.result() == work.value
+
+
+def test_calculation_cache_drops_edited_items(
+    core: Core,
+    rate: RateRow,
+) -> None:
+    bonus = add_bonus(core)
+    save_work(core, rate, bonus)
+    cache = core.calculation_cache
+    assert len(cache) == 1
+
+    core.money.update_bonus(
+        {"name": "Премия", "value": "500", "type": "fix", "by_default": 0},
+        bonus,
+    )
+    assert len(cache) == 0
+
+    save_work(core, rate, bonus)
+    core.money.update_item(
+        {
+            "name": "Смена",
+            "value": "1000",
+            "by_default": 0,
+            "hours": 8,
+            "type": "shift",
+        },
+        rate,
+    )
+    assert len(cache) == 0
+
+
+def test_calculation_cache_belongs_to_core(
+    core: Core,
+    rate: RateRow,
+    tmp_path: Path,
+) -> None:
+    save_work(core, rate, add_bonus(core))
+    other = start_core(tmp_path / "other.db")
+
+    assert other.calculation_cache is not core.calculation_cache
+    assert len(other.calculation_cache) == 0
+    other.db.close()
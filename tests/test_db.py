@@ -0,0 +1,72 @@
+"""Tests of data base component."""
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core.db import DataBase
+
+
+def count_rates(db: DataBase) -> int:
+    return db.execute(  # type: ignore
+        "SELECT count(*) FROM Rate",
+        result=ResultFetch.fetchone,
+    )[0]
+
+
+def add_rate(db: DataBase, name: str) -> None:
+    db.execute(
+        "INSERT INTO Rate (name, value, by_default) VALUES (?, 100, 0)",
+        (name,),
+    )
+
+
+def test_batch_commits_once(db: DataBase) -> None:
+    with db.batch():
+        add_rate(db, "first")
+        add_rate(db, "second")
+        assert db.connect.in_transaction
+    assert not db.connect.in_transaction
+    assert count_rates(db) == 2
+
+
+def test_batch_rolls_back_on_error(db: DataBase) -> None:
+    with pytest.raises(RuntimeError), db.batch():
+        add_rate(db, "first")
+        raise RuntimeError
+    assert count_rates(db) == 0
+    assert db.batch_depth == 0
+
+
+def test_nested_batch_rolls_back_only_savepoint(db: DataBase) -> None:
+    with db.batch():
+        add_rate(db, "outer")
+        with pytest.raises(RuntimeError), db.batch():
+            add_rate(db, "inner")
+            raise RuntimeError
+        with db.batch():
+            add_rate(db, "second inner")
+    names = db.execute(
+        "SELECT name FROM Rate ORDER BY id",
+        result=ResultFetch.fetchall,
+    )
+    assert names == [("outer",), ("second inner",)]
+
+
+def test_nested_batch_error_rolls_back_outer(db: DataBase) -> None:
+    with pytest.raises(RuntimeError), db.batch():
+        add_rate(db, "outer")
+        with db.batch():
+            add_rate(db, "inner")
+        raise RuntimeError
+    assert count_rates(db) == 0
+
+
+
+def test_prepare_db_introspects_schema_once(db: DataBase) -> None:
+    assert db.required_tables <= db.table_names
+    queries = db.queries.as_dict()["queries"]
+    introspections = sum(
+        record["count"]
+        for query, record in queries.items()
+        if "sqlite_master" in query
+    )
+    assert introspections == 1
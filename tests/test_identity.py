@@ -0,0 +1,41 @@
+"""Tests of identity map of table rows."""
+from workway.core import Core
+from workway.core.db.tables import RateRow
+
+
+def test_rows_are_shared(core: Core, rate: RateRow) -> None:
+    assert core.db.rate.get(id=rate.id) is rate
+    assert core.db.rate.select(id=rate.id)[0] is rate
+
+
+def test_reused_row_gets_new_values(core: Core, rate: RateRow) -> None:
+    core.db.execute(
+        "UPDATE Rate SET name = 'Ночь' WHERE id = ?",
+        (rate.id,),
+    )
+
+    assert core.db.rate.select(id=rate.id)[0] is rate
+    assert rate.name == "Ночь"
+
+
+def test_update_invalidates_row(core: Core, rate: RateRow) -> None:
+    core.db.rate.update({"name": "Ночь"}, id=rate.id)
+
+    row = core.db.rate.get(id=rate.id)
+    assert row is not rate
+    assert row.name == "Ночь"
+
+
+def test_changed_row_is_not_shared(core: Core, rate: RateRow) -> None:
+    rate.name = "Ночь"
+
+    row = core.db.rate.get(id=rate.id)
+    assert row is not rate
+    assert row.name == "Смена"
+
+
+def test_deleted_row_is_forgotten(core: Core, rate: RateRow) -> None:
+    core.db.rate.delete(id=rate.id)
+
+    assert core.db.identity.find(core.db.rate.name, rate.id) is None
+    assert core.db.rate.get(id=rate.id) is None
@@ -0,0 +1,158 @@
+"""Tests of main page subcore."""
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core import Core
+from workway.core.db.tables import RateRow
+
+
+def save_works(core: Core, rate: RateRow, starts: list[datetime]) -> None:
+    for start in starts:
+        core.main.work_maker.save_work(
+            rate,
+            [],
+            start,
+            start + timedelta(hours=12),
+            name=str(start),
+        )
+
+
+def test_iter_works_reads_all_pages(core: Core, rate: RateRow) -> None:
+    # several works end at the same time, pages are split between them
+    starts = [
+        datetime(2024, 1, 1, 8) + timedelta(days=day // 3)
+        for day in range(20)
+    ]
+    save_works(core, rate, starts)
+
+    works = list(core.main.iter_works(page_size=4))
+
+    assert len(works) == 20
+    assert len({work.id for work in works}) == 20
+    keys = [(work.end_datetime, work.id) for work in works]
+    assert keys == sorted(keys)
+
+
+def test_iter_works_range(core: Core, rate: RateRow) -> None:
+    save_works(core, rate, [
+        datetime(2024, 1, day, 8)
+        for day in range(1, 11)
+    ])
+
+    works = list(core.main.iter_works(
+        datetime(2024, 1, 3),
+        datetime(2024, 1, 6),
+        page_size=2,
+    ))
+
+    assert [work.start_dttm.day for work in works] == [3, 4, 5]
+
+
+def test_month_totals(core: Core, rate: RateRow) -> None:
+    save_works(core, rate, [
+        datetime(2024, 1, 30, 8),
+        datetime(2024, 1, 31, 20),
+        datetime(2024, 2, 1, 8),
+    ])
+
+    assert len(core.main.get_works("01", "2024")) == 2
+    # night work is in both months
+    assert len(core.main.get_works("02", "2024")) == 2
+    assert core.main.month_total("01", "2024") == 200000
+    assert core.main.daily_totals("02", "2024") == {"2024-02-01": 100000}
+
+
+def test_month_result_is_cached(core: Core, rate: RateRow) -> None:
+    save_works(core, rate, [datetime(2024, 1, 10, 8)])
+
+    first = core.main.month_result("01", "2024")
+    assert core.main.month_result("01", "2024") is first
+    assert core.main.get_works("01", "2024") is not first.works
+
+
+def test_month_cache_follows_work_changes(core: Core, rate: RateRow) -> None:
+    save_works(core, rate, [datetime(2024, 1, 10, 8)])
+    assert core.main.month_total("01", "2024") == 100000
+    assert core.main.month_total("03", "2024") == 0
+
+    # saved work drops its month
+    save_works(core, rate, [datetime(2024, 1, 11, 8)])
+    assert core.main.month_total("01", "2024") == 200000
+
+    # updated work drops months of old and new datetimes
+    work = core.main.get_works("01", "2024")[0]
+    start = datetime(2024, 3, 1, 8)
+    core.main.work_maker.update_work(
+        work,
+        rate,
+        [],
+        start,
+        start + timedelta(hours=12),
+    )
+    assert core.main.month_total("01", "2024") == 100000
+    assert core.main.month_total("03", "2024") == 100000
+
+    core.main.delete_work(core.main.get_works("03", "2024")[0])
+    assert core.main.get_works("03", "2024") == []
+
+
+def work_months(core: Core) -> dict[tuple[str, str], int]:
+    rows = core.db.execute(
+        "SELECT year, month, works FROM Work_Month",
+        result=ResultFetch.fetchall,
+    )
+    return {(year, month): works for year, month, works in rows}
+
+
+def filters(core: Core, year: str) -> tuple[list[str], dict[str, str]]:
+    years, months = core.main.filters_data(year)
+    return list(years), months
+
+
+def test_work_month_follows_work_changes(core: Core, rate: RateRow) -> None:
+    save_works(core, rate, [datetime(2024, 1, 10, 8)])
+    # night work is counted in both years
+    save_works(core, rate, [datetime(2023, 12, 31, 20)])
+    assert work_months(core) == {("2023", "12"): 1, ("2024", "01"): 2}
+    assert filters(core, "2024") == (["2023", "2024"], {"01": "Январь"})
+    assert filters(core, "2023") == (["2023", "2024"], {"12": "Декабрь"})
+
+    work = core.main.get_works("12", "2023")[0]
+    start = datetime(2024, 3, 31, 20)
+    core.main.work_maker.update_work(
+        work,
+        rate,
+        [],
+        start,
+        start + timedelta(hours=12),
+    )
+    assert work_months(core) == {
+        ("2024", "01"): 1,
+        ("2024", "03"): 1,
+        ("2024", "04"): 1,
+    }
+    assert filters(core, "2024") == (
+        ["2024"],
+        {"01": "Январь", "03": "Март", "04": "Апрель"},
+    )
+    assert filters(core, "2023") == (["2024"], {})
+
+    core.main.delete_work(core.main.get_works("03", "2024")[0])
+    assert work_months(core) == {("2024", "01"): 1}
+    assert filters(core, "2024") == (["2024"], {"01": "Январь"})
+
+    core.main.delete_work(core.main.get_works("01", "2024")[0])
+    assert work_months(core) == {}
+    assert filters(core, "2024") == ([], {})
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"condition": "id > ?", "parameters": (0,), "name": "x"},
+    {"parameters": (0,)},
+])
+def test_select_rejects_ignored_parameters(core: Core, kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        core.db.work.select(**kwargs)
@@ -0,0 +1,157 @@
+"""Tests of versioned migrations from db of first app versions."""
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core import Core
+from workway.core.db.migrations import MIGRATIONS
+
+from .conftest import start_core
+
+
+# Schema before versioned migrations, money is stored like REAL
+BASELINE_SCHEMA = (
+    "CREATE TABLE Rate (id INTEGER PRIMARY KEY NOT NULL, "
+    "name TEXT NOT NULL, value REAL NOT NULL, by_default REAL NOT NULL, "
+    "type TEXT DEFAULT 'shift' NOT NULL, hours INTEGER DEFAULT 8 NOT NULL, "
+    "state INTEGER DEFAULT 1 NOT NULL)",
+    "CREATE TABLE Bonus (id INTEGER PRIMARY KEY NOT NULL, "
+    "name TEXT NOT NULL, value REAL NOT NULL, by_default REAL NOT NULL, "
+    "state INTEGER DEFAULT 1 NOT NULL)",
+    "CREATE TABLE Rework (id INTEGER PRIMARY KEY NOT NULL, "
+    "value REAL NOT NULL, type TEXT DEFAULT 'fix' NOT NULL)",
+    "CREATE TABLE Work (id INTEGER PRIMARY KEY NOT NULL, "
+    "name TEXT NOT NULL, start_datetime TEXT NOT NULL, "
+    "end_datetime TEXT NOT NULL, hours INTEGER NOT NULL, "
+    "rate_id INTEGER NOT NULL, value REAL NOT NULL, "
+    "FOREIGN KEY (rate_id) REFERENCES Rate(id))",
+    "CREATE TABLE Work_Bonus (work_id INTEGER NOT NULL, "
+    "bonus_id INTEGER NOT NULL)",
+    "CREATE TABLE Setting (key TEXT PRIMARY KEY NOT NULL, "
+    "value TEXT NOT NULL)",
+)
+
+
+@pytest.fixture
+def baseline_db(db_path: Path) -> Path:
+    """Create db of first app version with two works."""
+    connect = sqlite3.connect(db_path)
+    for query in BASELINE_SCHEMA:
+        connect.execute(query)
+    connect.execute(
+        "INSERT INTO Rate (id, name, value, by_default) "
+        "VALUES (1, 'day', 2500.5, 1)"
+    )
+    connect.execute(
+        "INSERT INTO Bonus (id, name, value, by_default) "
+        "VALUES (1, 'bonus', 300, 0)"
+    )
+    connect.executemany(
+        "INSERT INTO Work (id, name, start_datetime, end_datetime, hours, "
+        "rate_id, value) VALUES (?, ?, ?, ?, 0, 1, ?)",
+        (
+            (1, "one", "2024-01-31 20:00:00", "2024-02-01 08:00:00", 2800.5),
+            (2, "two", "2024-02-10 08:00:00", "2024-02-10 20:00:00", 2500.5),
+        ),
+    )
+    connect.execute("INSERT INTO Work_Bonus VALUES (1, 1)")
+    connect.commit()
+    connect.close()
+    return db_path
+
+
+def fetchall(core: Core, query: str) -> list:
+    return core.db.execute(query, result=ResultFetch.fetchall)  # type: ignore
+
+
+def test_new_db_has_last_version(core: Core) -> None:
+    assert core.db.version == len(MIGRATIONS)
+
+
+def test_baseline_db_is_migrated(baseline_db: Path) -> None:
+    core = start_core(baseline_db)
+    assert core.db.version == len(MIGRATIONS)
+    assert core.db.required_tables <= core.db.table_names
+
+    # legacy columns
+    columns = {row[1] for row in fetchall(core, "PRAGMA table_info(Work)")}
+    assert {"description", "json", "state", "rework_id"} <= columns
+
+    # money in cents
+    assert fetchall(core, "SELECT value FROM Rate") == [(250050,)]
+    assert fetchall(core, "SELECT value FROM Bonus") == [(30000,)]
+    assert fetchall(core, "SELECT id, value FROM Work ORDER BY id") == [
+        (1, 280050),
+        (2, 250050),
+    ]
+    assert fetchall(
+        core,
+        "SELECT type FROM PRAGMA_TABLE_INFO('Work') WHERE name = 'value'",
+    ) == [("INTEGER",)]
+
+    # calendar of works counts work in months of start and end
+    assert fetchall(
+        core,
+        "SELECT year, month, works FROM Work_Month ORDER BY 1, 2",
+    ) == [("2024", "01", 1), ("2024", "02", 2)]
+
+    indexes = {row[0] for row in fetchall(
+        core,
+        "SELECT name FROM sqlite_master WHERE type = 'index'",
+    )}
+    assert {
+        "work_start_datetime_idx",
+        "work_end_datetime_idx",
+        "work_bonus_work_id_idx",
+        "work_bonus_bonus_id_idx",
+        "work_rate_id_idx",
+    } <= indexes
+    core.db.close()
+
+
+def test_other_income_is_moved_from_json(db_path: Path) -> None:
+    core = start_core(db_path)
+    core.db.execute(
+        "INSERT INTO Rate (id, name, value, by_default) VALUES (1, '', 1, 0)"
+    )
+    core.db.execute(
+        "INSERT INTO Work (id, name, start_datetime, end_datetime, hours, "
+        "rate_id, value, json, state, description) VALUES "
+        "(1, '', '2024-01-01 08:00:00', '2024-01-01 20:00:00', 0, 1, 0, ?, "
+        "1, '')",
+        (json.dumps({"other_income": [
+            {"name": "tip", "value": 150},
+            {"name": "taxi", "value": 700},
+        ]}),),
+    )
+    # db before the last migration
+    core.db.execute(f"PRAGMA user_version = {len(MIGRATIONS) - 1}")
+    core.db.close()
+
+    core = start_core(db_path)
+    assert core.db.version == len(MIGRATIONS)
+    assert fetchall(
+        core,
+        "SELECT work_id, position, name, value FROM Other_Income "
+        "ORDER BY position",
+    ) == [(1, 0, "tip", 150), (1, 1, "taxi", 700)]
+    assert fetchall(core, "SELECT json FROM Work") == [("{}",)]
+    assert core.db.work.get(id=1).other_income == [
+        {"name": "tip", "value": 150},
+        {"name": "taxi", "value": 700},
+    ]
+    core.db.close()
+
+
+def test_migrations_are_applied_once(baseline_db: Path) -> None:
+    start_core(baseline_db).db.close()
+    core = start_core(baseline_db)
+    assert fetchall(core, "SELECT value FROM Rate") == [(250050,)]
+    assert fetchall(
+        core,
+        "SELECT sum(works) FROM Work_Month",
+    ) == [(3,)]
+    core.db.close()
@@ -0,0 +1,57 @@
+"""Tests of integer money helpers."""
+import pytest
+
+from workway.money import format_cents
+from workway.money import percent_of
+from workway.money import to_cents
+
+
+@pytest.mark.parametrize(("value", "cents"), [
+    (0, 0),
+    (15, 1500),
+    ("15", 1500),
+    (" 15 ", 1500),
+    ("15.5", 1550),
+    ("15,5", 1550),
+    ("0.01", 1),
+    (0.1, 10),
+    (2500.55, 250055),
+    ("0.005", 1),
+    ("-1.5", -150),
+])
+def test_to_cents(value: str | int | float, cents: int) -> None:
+    assert to_cents(value) == cents
+
+
+def test_to_cents_rejects_text() -> None:
+    with pytest.raises(ArithmeticError):
+        to_cents("rate")
+
+
+@pytest.mark.parametrize(("cents", "text"), [
+    (0, "0"),
+    (1500, "15"),
+    (1550, "15.50"),
+    (1, "0.01"),
+    (-150, "-1.50"),
+    (-1, "-0.01"),
+])
+def test_format_cents(cents: int, text: str) -> None:
+    assert format_cents(cents) == text
+
+
+@pytest.mark.parametrize("cents", [0, 1, 99, 1550, 250055, -150])
+def test_format_cents_is_reverse_of_to_cents(cents: int) -> None:
+    assert to_cents(format_cents(cents)) == cents
+
+
+@pytest.mark.parametrize(("value", "percent", "result"), [
+    (100000, 1000, 10000),
+    (100000, 5000, 50000),
+    (1, 5000, 1),
+    (3, 5000, 2),
+    (333, 3333, 111),
+    (0, 10000, 0),
+])
+def test_percent_of(value: int, percent: int, result: int) -> None:
+    assert percent_of(value, percent) == result
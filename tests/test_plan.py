@@ -0,0 +1,100 @@
+"""Tests of pay plans against calculation of one work."""
+import random
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+from workway.core.subcores.plan import PayPlan
+from workway.core.subcores.recalculation import WorkerBonus
+from workway.core.subcores.recalculation import WorkerRate
+from workway.core.subcores.recalculation import calculate_values
+from workway.core.subcores.work import Сalculation
+
+
+RATES = (
+    WorkerRate(1, "shift", "shift", 250050, 12),
+    WorkerRate(2, "hours", "hours", 33333, 8),
+)
+BONUSES = (
+    WorkerBonus(1, "fix", "fix", 50000),
+    WorkerBonus(2, "percent", "percent", 1550),
+    WorkerBonus(3, "big percent", "percent", 10000),
+)
+REWORKS = (
+    None,
+    {"type": "percent", "value": 5000},
+    {"type": "percent", "value": 15033},
+    {"type": "fix", "value": 120050},
+)
+
+
+def make_works(count: int) -> list[tuple]:
+    """Return random rate, bonuses, start, end, rework, other income."""
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1, 8)
+    works = []
+    for _ in range(count):
+        bonuses = [
+            {"bonus": bonus, "on_full_sum": rng.random() < 0.5}
+            for bonus in rng.sample(BONUSES, rng.randint(0, len(BONUSES)))
+        ]
+        duration = timedelta(minutes=rng.randrange(60, 30 * 60, 15))
+        other_income = [
+            {"name": "income", "value": rng.randrange(0, 10000)}
+            for _ in range(rng.randint(0, 2))
+        ]
+        works.append((
+            rng.choice(RATES),
+            bonuses,
+            start,
+            start + duration,
+            rng.choice(REWORKS),
+            other_income,
+        ))
+    return works
+
+
+def calculate(work: tuple) -> int:
+    return Сalculation(None, *work).result()  # type: ignore
+
+
+@pytest.mark.parametrize("work", make_works(200))
+def test_plan_equals_calculation(work: tuple) -> None:
+    rate, bonuses, start, end, rework, other_income = work
+    plan = PayPlan(rate, bonuses)
+
+    values = plan.apply(
+        [int((end - start).total_seconds())],
+        [rework],
+        [sum(income["value"] for income in other_income)],
+    )
+
+    assert list(values) == [calculate(work)]
+
+
+def test_plan_key_does_not_depend_on_bonus_order() -> None:
+    bonuses = [
+        {"bonus": BONUSES[0], "on_full_sum": False},
+        {"bonus": BONUSES[1], "on_full_sum": True},
+    ]
+    assert PayPlan.make_key(RATES[0], bonuses) == PayPlan.make_key(
+        RATES[0],
+        bonuses[::-1],
+    )
+
+
+def test_calculate_values_keeps_order_of_works() -> None:
+    works = make_works(500)
+    items = [
+        (
+            rate,
+            bonuses,
+            int((end - start).total_seconds()),
+            rework,
+            sum(income["value"] for income in other_income),
+        )
+        for rate, bonuses, start, end, rework, other_income in works
+    ]
+
+    assert list(calculate_values(items)) == [calculate(work) for work in works]
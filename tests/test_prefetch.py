@@ -0,0 +1,77 @@
+"""Tests of prefetched relations of works."""
+from datetime import datetime
+from datetime import timedelta
+
+from workway.core import Core
+from workway.core.db.tables import BonusRow
+from workway.core.db.tables import RateRow
+
+
+def add_bonus(core: Core) -> BonusRow:
+    return core.money.add_bonus({
+        "name": "Премия",
+        "value": "10",
+        "by_default": 0,
+        "type": "percent",
+    })
+
+
+def save_works(core: Core, rate: RateRow, bonus: BonusRow, count: int) -> None:
+    for day in range(count):
+        start = datetime(2024, 1, 1, 8) + timedelta(days=day)
+        core.main.work_maker.save_work(
+            rate,
+            [{"bonus": bonus, "on_full_sum": True}],
+            start,
+            start + timedelta(hours=12),
+            rework={"value": 5000, "type": "fix"},
+            other_income=[{"name": "Чаевые", "value": 100 * day}],
+        )
+
+
+def executed(core: Core) -> int:
+    queries = core.settings.query_stats()["queries"]["queries"]
+    return sum(record["count"] for record in queries.values())
+
+
+def read_month(core: Core, count: int) -> int:
+    """Read works of month with relations, return count of queries."""
+    core.settings.reset_query_stats()
+    works = core.main.get_works_with_relations("01", "2024")
+    assert len(works) == count
+    for work in works:
+        assert work.rate is not None
+        assert work.rework is not None
+        assert len(work.bonuses) == 1
+        assert len(work.completed_bonuses) == 1
+        assert len(work.other_income) == 1
+    return executed(core)
+
+
+def test_prefetch_queries_do_not_grow(core: Core, rate: RateRow) -> None:
+    bonus = add_bonus(core)
+    # first read introspects schema of tables
+    save_works(core, rate, bonus, 1)
+    read_month(core, 1)
+
+    save_works(core, rate, bonus, 1)
+    few = read_month(core, 2)
+    save_works(core, rate, bonus, 20)
+    assert read_month(core, 22) == few
+
+
+def test_prefetched_relations_run_no_queries(
+    core: Core,
+    rate: RateRow,
+) -> None:
+    bonus = add_bonus(core)
+    save_works(core, rate, bonus, 3)
+    works = core.main.get_works_with_relations("01", "2024")
+
+    core.settings.reset_query_stats()
+    completed = [work.completed_bonuses for work in works]
+    other_income = [work.other_income for work in works]
+
+    assert executed(core) == 0
+    assert completed == [[{"bonus": bonus, "on_full_sum": True}]] * 3
+    assert sorted(item[0]["value"] for item in other_income) == [0, 100, 200]
@@ -0,0 +1,248 @@
+"""Tests of bulk recalculation of works money."""
+import shutil
+import sys
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core import Core
+from workway.core.db.tables import RateRow
+from workway.core.subcores.recalculation import Recalculation
+from workway.core.subcores.recalculation import can_spawn_workers
+from workway.core.subcores.settings import Settings
+
+from .conftest import start_core
+
+
+def fill_works(core: Core, rate: RateRow, count: int) -> None:
+    bonus = core.money.add_bonus({
+        "name": "Ночные",
+        "value": "20",
+        "by_default": 0,
+        "type": "percent",
+    })
+    start = datetime(2024, 1, 1, 8)
+    for day in range(count):
+        start_datetime = start + timedelta(days=day)
+        core.main.work_maker.save_work(
+            rate,
+            [{"bonus": bonus, "on_full_sum": bool(day % 2)}] * (day % 3 > 0),
+            start_datetime,
+            start_datetime + timedelta(hours=8 + day % 5),
+            rework={"type": "percent", "value": 5000} if day % 4 else None,
+        )
+
+
+def saved_money(core: Core) -> tuple[list, list]:
+    values = core.db.execute(
+        "SELECT id, value FROM Work ORDER BY id",
+        result=ResultFetch.fetchall,
+    )
+    breakdown = core.db.execute(
+        "SELECT * FROM Work_Breakdown ORDER BY work_id, position",
+        result=ResultFetch.fetchall,
+    )
+    return values, breakdown  # type: ignore
+
+
+def test_recalculate_changed_rate(core: Core, rate: RateRow) -> None:
+    fill_works(core, rate, 20)
+    core.db.execute("UPDATE Rate SET hours = 10 WHERE id = ?", (rate.id,))
+    core.calculation_cache.clear()
+    before = saved_money(core)
+
+    changed = Recalculation(core, core.db).recalculate([rate.id])
+
+    after = saved_money(core)
+    assert 0 < changed < 20
+    assert after != before
+    # the same result as calculation of new works
+    assert Recalculation(core, core.db).recalculate([rate.id]) == 0
+
+
+def test_edited_rate_recalculates_works(core: Core, rate: RateRow) -> None:
+    fill_works(core, rate, 10)
+    before = saved_money(core)
+
+    core.money.update_item(
+        {
+            "name": rate.name,
+            "value": "1000",
+            "by_default": 1,
+            "hours": 10,
+            "type": "shift",
+        },
+        rate,
+    )
+
+    assert saved_money(core) != before
+    assert Recalculation(core, core.db).recalculate([rate.id]) == 0
+
+
+def test_edited_bonus_recalculates_works(core: Core, rate: RateRow) -> None:
+    fill_works(core, rate, 10)
+    bonus = core.money.all_bonus()[0]
+    before = saved_money(core)
+
+    core.money.update_bonus(
+        {
+            "name": bonus.name,
+            "value": "30",
+            "type": "percent",
+            "by_default": 0,
+        },
+        bonus,
+    )
+
+    assert saved_money(core) != before
+    assert Recalculation(core, core.db).recalculate(
+        bonus_ids=[bonus.id],
+    ) == 0
+
+
+def breakdown_names(core: Core) -> set[str]:
+    rows = core.db.execute(
+        "SELECT DISTINCT name FROM Work_Breakdown",
+        result=ResultFetch.fetchall,
+    )
+    return {row[0] for row in rows}  # type: ignore
+
+
+def test_renamed_rate_and_bonus_refresh_breakdown(
+    core: Core,
+    rate: RateRow,
+) -> None:
+    fill_works(core, rate, 10)
+    bonus = core.money.all_bonus()[0]
+    before = saved_money(core)[0]
+
+    core.money.update_item(
+        {
+            "name": "Новая смена",
+            "value": "1000",
+            "by_default": 1,
+            "hours": 8,
+            "type": "shift",
+        },
+        rate,
+    )
+    core.money.update_bonus(
+        {
+            "name": "Новые ночные",
+            "value": "20",
+            "type": "percent",
+            "by_default": 0,
+        },
+        bonus,
+    )
+
+    assert saved_money(core)[0] == before
+    names = breakdown_names(core)
+    assert {"Новая смена", "Новые ночные"} <= names
+    assert not {"Смена", "Ночные"} & names
+
+
+def test_missing_breakdown_is_not_saved_on_read(
+    core: Core,
+    rate: RateRow,
+) -> None:
+    fill_works(core, rate, 1)
+    work = core.main.get_works("01", "2024")[0]
+    saved = core.main.work_maker.get_work_breakdown(work)
+    core.db.execute("DELETE FROM Work_Breakdown")
+
+    assert core.main.work_maker.get_work_breakdown(work) == saved
+    assert saved_money(core)[1] == []
+
+
+@pytest.mark.skipif(not can_spawn_workers(), reason="no python executable")
+def test_parallel_equals_serial(core: Core, rate: RateRow) -> None:
+    fill_works(core, rate, 40)
+    core.db.execute("UPDATE Rate SET hours = 10 WHERE id = ?", (rate.id,))
+    core.db.close()
+    path = Path(core.db_path)
+    parallel_path = path.with_name("parallel.db")
+    shutil.copyfile(path, parallel_path)
+
+    serial = start_core(path)
+    serial_count = Recalculation(serial, serial.db).recalculate([rate.id])
+    serial_money = saved_money(serial)
+    serial.db.close()
+
+    parallel = start_core(parallel_path)
+    parallel_count = Recalculation(parallel, parallel.db).recalculate(
+        [rate.id],
+        workers=2,
+    )
+    assert parallel_count == serial_count
+    assert saved_money(parallel) == serial_money
+    parallel.db.close()
+
+
+def test_packaged_app_recalculates_in_process(
+    core: Core,
+    rate: RateRow,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(sys, "executable", "/opt/workway/workway")
+    assert not can_spawn_workers()
+    assert core.settings.max_recalc_workers == 1
+
+    def parallel(*args: object) -> None:
+        raise AssertionError
+
+    recalculation = Recalculation(core, core.db)
+    monkeypatch.setattr(
+        Recalculation,
+        "_calculate_deltas_parallel",
+        parallel,
+    )
+    fill_works(core, rate, 5)
+    core.db.execute("UPDATE Rate SET hours = 10 WHERE id = ?", (rate.id,))
+    assert recalculation.recalculate([rate.id], workers=4) > 0
+
+
+@pytest.mark.skipif(not can_spawn_workers(), reason="no python executable")
+def test_parallel_without_works(core: Core, rate: RateRow) -> None:
+    unused = core.money.add_rate({
+        "name": "Ночь",
+        "value": "1500",
+        "by_default": 0,
+        "hours": 12,
+        "type": "shift",
+    })
+
+    assert core.money.recalculate_works(rate_ids=(unused.id,), workers=2) == 0
+    assert Recalculation(core, core.db).shard_ranges("1 = 0", (), 4) == []
+
+
+def test_edit_unused_rate_with_workers(
+    core: Core,
+    rate: RateRow,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(Settings, "recalc_workers", 2)
+    fill_works(core, rate, 3)
+    unused = core.money.add_rate({
+        "name": "Ночь",
+        "value": "1500",
+        "by_default": 0,
+        "hours": 12,
+        "type": "shift",
+    })
+
+    core.money.update_item(
+        {
+            "name": "Ночная",
+            "value": "1500",
+            "by_default": 0,
+            "hours": 10,
+            "type": "shift",
+        },
+        unused,
+    )
+
+    assert core.db.rate.get(id=unused.id).name == "Ночная"
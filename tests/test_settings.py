@@ -0,0 +1,73 @@
+"""Tests of settings subcore and its store."""
+from pathlib import Path
+
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core import Core
+
+from .conftest import start_core
+
+
+def test_settings_are_saved(core: Core, db_path: Path) -> None:
+    core.settings.set_theme("light")
+    core.settings.set_db_profile("fast")
+    core.settings.set_slow_query_ms(25)
+    core.settings.set_theme("dark")
+    core.db.close()
+
+    core = start_core(db_path)
+    assert core.settings.current_theme == "dark"
+    assert core.settings.db_profile == "fast"
+    assert core.db.profile == "fast"
+    assert core.settings.slow_query_ms == 25
+    core.db.close()
+
+
+def test_settings_are_read_from_memory(core: Core) -> None:
+    core.settings.set_theme("light")
+    core.settings.reset_query_stats()
+
+    assert core.settings.current_theme == "light"
+    assert core.settings.recalc_workers == 1
+    assert core.settings.query_stats()["queries"]["queries"] == {}
+
+
+def test_wrong_values_are_rejected(core: Core) -> None:
+    with pytest.raises(ValueError):
+        core.settings.set_db_profile("unknown")
+    with pytest.raises(ValueError):
+        core.settings.set_slow_query_ms(-1)
+    with pytest.raises(ValueError):
+        core.settings.set_recalc_workers(0)
+
+
+def pragmas(core: Core) -> tuple:
+    return tuple(
+        core.db.execute(f"PRAGMA {pragma}", result=ResultFetch.fetchone)[0]
+        for pragma in ("journal_mode", "synchronous", "foreign_keys")
+    )
+
+
+def test_db_profile_is_applied(core: Core, db_path: Path) -> None:
+    assert pragmas(core) == ("delete", 2, 0)
+
+    core.settings.set_db_profile("fast")
+    assert pragmas(core) == ("wal", 1, 1)
+    core.db.close()
+
+    core = start_core(db_path)
+    assert core.db.profile == "fast"
+    assert pragmas(core) == ("wal", 1, 1)
+
+    with pytest.raises(ValueError):
+        core.settings.set_db_profile("turbo")
+    assert core.settings.db_profile == "fast"
+    assert pragmas(core) == ("wal", 1, 1)
+    core.db.close()
+
+    core = start_core(db_path)
+    assert core.settings.db_profile == "fast"
+    core.settings.set_db_profile("default")
+    assert pragmas(core) == ("delete", 2, 0)
+    core.db.close()
@@ -0,0 +1,60 @@
+"""Tests of query statistics."""
+from workway.core import Core
+from workway.core.db.stats import QueryStats
+from workway.core.db.stats import StatementStats
+
+
+def test_query_stats_keep_recent_statements() -> None:
+    stats = QueryStats(size=3)
+    for index in range(10):
+        stats.register(f"SELECT {index}", 0.001, 1, "")
+    stats.register("SELECT 7", 0.001, 1, "")
+
+    queries = stats.as_dict()["queries"]
+    assert set(queries) == {"SELECT 7", "SELECT 8", "SELECT 9"}
+    assert queries["SELECT 7"]["count"] == 2
+
+
+def test_statement_stats_are_bounded() -> None:
+    stats = StatementStats(2, prepares_size=4)
+    for index in range(100):
+        stats.register(f"SELECT {index}")
+
+    assert stats.prepared == 100
+    assert len(stats.prepares) <= 4
+    assert stats.as_dict()["estimated"]
+
+
+def callers(core: Core) -> set[str]:
+    queries = core.settings.query_stats()["queries"]["queries"]
+    return {
+        caller
+        for record in queries.values()
+        for caller in record["callers"]
+    }
+
+
+def test_callers_are_searched_only_with_trace(core: Core) -> None:
+    core.settings.reset_query_stats()
+    core.main.get_works("01", "2024")
+    assert callers(core) == set()
+
+    core.settings.set_trace_queries(True)
+    core.main.get_works("02", "2024")
+    assert "main.Main.month_result" in callers(core)
+
+
+def test_slow_queries_are_explained_without_trace(core: Core) -> None:
+    core.settings.reset_query_stats()
+    core.settings.set_slow_query_ms(0.000001)
+    assert not core.db.queries.trace
+
+    core.main.get_works("01", "2024")
+    selects = [
+        record
+        for record in core.db.queries.slow
+        if record["query"].lstrip().upper().startswith("SELECT")
+    ]
+    assert selects
+    assert all(record["plan"] for record in selects)
+    assert all(record["caller"] == "" for record in selects)
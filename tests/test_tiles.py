@@ -0,0 +1,60 @@
+"""Tests of rate and bonus tiles of money page."""
+from types import SimpleNamespace
+
+import pytest
+
+from workway.core import Core
+from workway.core.db.tables import RateRow
+
+
+flet = pytest.importorskip("flet")
+
+from workway.gui.pages.money.tiles import BonusTile  # noqa: E402
+from workway.gui.pages.money.tiles import RateTile  # noqa: E402
+
+
+def test_rate_tile_shows_money_after_update(
+    core: Core,
+    rate: RateRow,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(RateTile, "update", lambda self: None)
+    tile = RateTile(core.money, rate)
+    assert tile.subtitle.value == rate.pretify_money
+
+    new = core.money.replace_rate(
+        {
+            "name": "Смена",
+            "value": "1500.5",
+            "by_default": 1,
+            "hours": 8,
+            "type": "shift",
+        },
+        rate,
+    )
+    tile.update_rate(SimpleNamespace(new_rate=new))
+    assert tile.subtitle.value == new.pretify_money
+    assert tile.subtitle.value != str(new.value)
+
+
+def test_bonus_tile_shows_money_after_update(
+    core: Core,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(BonusTile, "update", lambda self: None)
+    bonus = core.money.add_bonus({
+        "name": "Премия",
+        "value": "500",
+        "by_default": 0,
+        "type": "fix",
+    })
+    tile = BonusTile(core.money, bonus)
+    assert tile.subtitle.value == bonus.pretify_money
+
+    new = core.money.replace_bonus(
+        {"name": "Премия", "value": "10", "type": "percent", "by_default": 0},
+        bonus,
+    )
+    tile.update_bonus(SimpleNamespace(new_bonus=new))
+    assert tile.subtitle.value == new.pretify_money
+    assert tile.subtitle.value.endswith("%")
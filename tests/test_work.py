@@ -0,0 +1,173 @@
+"""Tests of saving works."""
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+from lildb.enumcls import ResultFetch
+
+from workway.core import Core
+from workway.core.db.tables import RateRow
+from workway.core.subcores.work import WorkMaker
+
+
+START = datetime(2024, 1, 10, 8)
+
+
+def save_work(core: Core, rate: RateRow, other_income: list) -> None:
+    core.main.work_maker.save_work(
+        rate,
+        [],
+        START,
+        START + timedelta(hours=8),
+        other_income=other_income,
+    )
+
+
+def test_other_income_is_saved(core: Core, rate: RateRow) -> None:
+    save_work(core, rate, [
+        {"name": "Чаевые", "value": 50000},
+        {"name": "Такси", "value": 70000},
+    ])
+
+    work = core.main.get_works("01", "2024")[0]
+    assert work.other_income == [
+        {"name": "Чаевые", "value": 50000},
+        {"name": "Такси", "value": 70000},
+    ]
+    assert work.value == 100000 + 120000
+    assert core.main.other_income_totals() == {
+        "Такси": 70000,
+        "Чаевые": 50000,
+    }
+
+
+def test_other_income_is_updated(core: Core, rate: RateRow) -> None:
+    save_work(core, rate, [{"name": "Чаевые", "value": 50000}])
+    work = core.main.get_works("01", "2024")[0]
+
+    core.main.work_maker.update_work(
+        work,
+        rate,
+        [],
+        work.start_dttm,
+        work.end_dttm,
+        other_income=[{"name": "Такси", "value": 100}],
+    )
+
+    work = core.db.work.get(id=work.id)
+    assert work.other_income == [{"name": "Такси", "value": 100}]
+    assert work.value == 100000 + 100
+
+
+def test_other_income_totals_by_range(core: Core, rate: RateRow) -> None:
+    save_work(core, rate, [{"name": "Чаевые", "value": 50000}])
+
+    assert core.main.other_income_totals("2024-01", "2024-02") == {
+        "Чаевые": 50000,
+    }
+    assert core.main.other_income_totals("2024-02", "2024-03") == {}
+
+
+def test_deleted_work_has_no_rows(core: Core, rate: RateRow) -> None:
+    save_work(core, rate, [{"name": "Чаевые", "value": 50000}])
+
+    core.main.delete_work(core.main.get_works("01", "2024")[0])
+
+    for table in ("Work_Breakdown", "Other_Income", "Work_Month"):
+        assert core.db.execute(
+            f"SELECT count(*) FROM {table}",
+            result=ResultFetch.fetchone,
+        ) == (0,)
+
+
+def row_counts(core: Core) -> dict[str, int]:
+    return {
+        table: core.db.execute(
+            f"SELECT count(*) FROM {table}",
+            result=ResultFetch.fetchone,
+        )[0]
+        for table in (
+            "Work",
+            "Rework",
+            "Work_Bonus",
+            "Other_Income",
+            "Work_Breakdown",
+        )
+    }
+
+
+def fail_breakdown(*args: object) -> None:
+    raise RuntimeError
+
+
+def test_failed_save_leaves_no_rows(
+    core: Core,
+    rate: RateRow,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(WorkMaker, "_save_work_breakdown", fail_breakdown)
+
+    with pytest.raises(RuntimeError):
+        core.main.work_maker.save_work(
+            rate,
+            [],
+            START,
+            START + timedelta(hours=8),
+            rework={"value": 5000, "type": "fix"},
+            other_income=[{"name": "Чаевые", "value": 50000}],
+        )
+
+    assert set(row_counts(core).values()) == {0}
+    assert not core.db.connect.in_transaction
+
+
+def test_failed_update_keeps_work(
+    core: Core,
+    rate: RateRow,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    save_work(core, rate, [{"name": "Чаевые", "value": 50000}])
+    counts = row_counts(core)
+    work = core.main.get_works("01", "2024")[0]
+    monkeypatch.setattr(WorkMaker, "_update_work_breakdown", fail_breakdown)
+
+    with pytest.raises(RuntimeError):
+        core.main.work_maker.update_work(
+            work,
+            rate,
+            [],
+            START,
+            START + timedelta(hours=12),
+            rework={"value": 5000, "type": "fix"},
+            other_income=[{"name": "Такси", "value": 100}],
+        )
+
+    assert row_counts(core) == counts
+    work = core.db.work.get(id=work.id)
+    assert work.end_dttm == START + timedelta(hours=8)
+    assert work.rework_id is None
+    assert work.other_income == [{"name": "Чаевые", "value": 50000}]
+
+
+def test_save_and_update_commit_once(core: Core, rate: RateRow) -> None:
+    statements: list[str] = []
+    core.db.connect.set_trace_callback(statements.append)
+
+    save_work(core, rate, [{"name": "Чаевые", "value": 50000}])
+    work = core.main.get_works("01", "2024")[0]
+    commits = [item for item in statements if item.upper() == "COMMIT"]
+    assert len(commits) == 1
+
+    statements.clear()
+    core.main.work_maker.update_work(
+        work,
+        rate,
+        [],
+        START,
+        START + timedelta(hours=12),
+        rework={"value": 5000, "type": "fix"},
+        other_income=[{"name": "Такси", "value": 100}],
+    )
+    core.db.connect.set_trace_callback(None)
+    commits = [item for item in statements if item.upper() == "COMMIT"]
+    assert len(commits) == 1
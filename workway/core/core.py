@@ -8,6 +8,9 @@ from .db import DataBase
 from .subcores import Main
 from .subcores import Money
 from .subcores import Settings
+from .subcores.cache import CalculationCache
+from .subcores.cache import MonthCache
+from .subcores.catalog import Catalog
 
 
 class Core:
@@ -21,9 +24,12 @@ class Core:
         cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self) -> None:
-        self.db_path = self.get_db_path(debug=False)
+    def __init__(self, db_path: Path | None = None) -> None:
+        self.db_path = db_path or self.get_db_path(debug=False)
         self.db = DataBase(str(self.db_path), use_datacls=True)
+        self.catalog = Catalog(self.db)
+        self.calculation_cache = CalculationCache()
+        self.month_cache = MonthCache()
 
         self.money = Money(self, self.db)
         self.main = Main(self, self.db)
@@ -43,6 +49,9 @@ class Core:
     def reinitialize_db(self):
         self.db.__class__._instances = {}  # type: ignore
         self.db = DataBase(str(self.db_path), use_datacls=True)
+        self.calculation_cache.clear()
+        self.catalog.clear(self.db)
+        self.month_cache.clear()
 
         for subcore in ("money", "main", "settings"):
             getattr(self, subcore).db = self.db
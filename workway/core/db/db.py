@@ -1,11 +1,17 @@
 """Module contain component with business logic."""
 from __future__ import annotations
 
+import logging
 import sqlite3
-from sqlite3 import OperationalError
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import MutableMapping
 from typing import Sequence
 
@@ -14,17 +20,39 @@ from lildb.column_types import Integer
 from lildb.column_types import Real
 from lildb.column_types import Text
 from lildb.enumcls import ResultFetch
+from lildb.table import Table
 
 from .column import ForeignKey
+from .identity import IdentityMap
+from .migrations import MIGRATIONS
 from .operation import CreateTable
+from .profiles import DEFAULT_PROFILE
+from .profiles import PROFILES
+from .stats import QueryStats
+from .stats import StatementStats
+from .store import SettingStore
 from .tables import BonusTable
 from .tables import RateTable
+from .tables import ReworkTable
 from .tables import Work_Bonus
 from .tables import WorkTable
 
 
-if TYPE_CHECKING:
-    from lildb.table import Table
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+# Queries of this commands have query plan
+EXPLAINED_COMMANDS = frozenset((
+    "select",
+    "with",
+    "insert",
+    "update",
+    "delete",
+))
+
+# Frames of this packages are skipped while caller of query is searched
+INTERNAL_PACKAGES = (__package__, "lildb", "functools")
 
 
 class DataBase(DB):
@@ -32,127 +60,265 @@ class DataBase(DB):
 
     rate = RateTable("rate")
     bonus = BonusTable("bonus")
+    rework = ReworkTable("rework")
     work = WorkTable("work")
     work_bonus = Work_Bonus("work_bonus")
 
+    required_tables = frozenset((
+        "rate",
+        "bonus",
+        "rework",
+        "work",
+        "work_bonus",
+        "work_month",
+        "work_breakdown",
+        "other_income",
+        "setting",
+    ))
+
     def __init__(
         self,
         path: str,
         *,
         use_datacls: bool = True,
+        cached_statements: int = 128,
+        profile: str | None = None,
+        slow_query_ms: float | None = None,
         **connect_params: Any,
     ) -> None:
         self.path = path
         self.connect: sqlite3.Connection = sqlite3.connect(
             path,
+            cached_statements=cached_statements,
             **connect_params,
         )
+        self.statements = StatementStats(cached_statements)
+        self.identity = IdentityMap()
+        self.queries = QueryStats(
+            DEFAULT_SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms,
+        )
+        self.batch_depth = 0
+        self.store = SettingStore(self)
+        self.store.load()
+        self.profile = DEFAULT_PROFILE
+        self.apply_profile(profile or self.stored_profile())
+        if slow_query_ms is None:
+            self.queries.slow_ms = self.stored_slow_query_ms()
+        self.queries.trace = bool(self.store.get_int("trace_queries", 0))
         self.use_datacls = use_datacls
         self.table_names: set = set()
         self.create_table = CreateTable(self)
         self.prepare_db()
 
+    def stored_profile(self) -> str:
+        """Return performance profile name saved in settings."""
+        profile = self.store.get("db_profile")
+        if profile not in PROFILES:
+            return DEFAULT_PROFILE
+        return profile  # type: ignore
+
+    def apply_profile(self, name: str) -> None:
+        """Apply pragmas of performance profile to connection."""
+        if name not in PROFILES:
+            msg = f"Unknown profile '{name}'."
+            raise ValueError(msg)
+        for pragma, value in PROFILES[name].items():
+            self.execute(f"PRAGMA {pragma} = {value}")
+        self.profile = name
+
+    @classmethod
+    def connect_read_only(cls, path: str) -> sqlite3.Connection:
+        """Open read only connection to db file for worker process."""
+        uri = cls.normalize_path(Path(path)).as_uri()
+        return sqlite3.connect(f"{uri}?mode=ro", uri=True)
+
+    def checkpoint(self) -> None:
+        """Move WAL content to db file, so db file is complete copy."""
+        self.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def prepare_db(self):
-        """Prepare data base for work."""
-        self.initialize_db()
+        """Prepare data base for work.
+
+        Schema is introspected by one query, missing tables are created
+        and then all tables are initialized once.
+        """
+        names = self.schema_table_names()
+        if not self.required_tables <= {name.lower() for name in names}:
+            names = {*names, *self.initialize_db()}
+        self.initialize_tables(names)
         self.migrations()
-        self.initialize_tables()
-
-    def initialize_db(self) -> None:
-        """Create all tables."""
-        self.create_table(
-            "Rate",
-            {
-                "id": Integer(primary_key=True),
-                "name": Text(default=""),
-                "value": Real(default=0),  # type: ignore
-                "by_default": Real(default=0),  # type: ignore
-                "type": Text(default="shift"),
-                "hours": Integer(default=8),
-                "state": Integer(default=1),
-            }
-        )
-        self.create_table(
-            "Bonus",
-            {
-                "id": Integer(primary_key=True),
-                "name": Text(default=""),
-                "value": Real(default=0),  # type: ignore
-                "by_default": Real(default=0),  # type: ignore
-                "state": Integer(default=1),
-                "type": Text(default="fix"),
-            }
-        )
-        self.create_table(
-            "Rework",
-            {
-                "id": Integer(primary_key=True),
-                "value": Real(default=0),  # type: ignore
-                "type": Text(default="fix"),
-            }
-        )
-        self.create_table(
-            "Work",
-            {
-                "id": Integer(primary_key=True),
-                "name": Text(default=""),
-                "start_datetime": Text(),
-                "end_datetime": Text(),
-                "hours": Integer(),
-                "rate_id": Integer(),
-                "rework_id": Integer(nullable=True),
-                "value": Real(),
-                "json": Text(),
-                "state": Integer(default=1),
-                "description": Text(default="")
-            },
-            foreign_keys=(
-                ForeignKey("rate_id", "Rate", "id"),
-                ForeignKey("rework_id", "Rework", "id"),
+
+    def schema_table_names(self) -> list[str]:
+        """Return names of tables in db schema."""
+        return [
+            row[0]
+            for row in self.execute(  # type: ignore
+                "SELECT name FROM sqlite_master WHERE type='table';",
+                result=ResultFetch.fetchall,
             )
-        )
-        self.create_table(
-            "Work_Bonus",
-            {
-                "work_id": Integer(),
-                "bonus_id": Integer(),
-                "on_full_sum": Integer(default=0),
-            },
-            foreign_keys=(
-                ForeignKey("work_id", "Work", "id", on_delete="cascade"),
-                ForeignKey("bonus_id", "Bonus", "id", on_delete="cascade"),
+        ]
+
+    def initialize_tables(self, names: Iterable[str] | None = None) -> None:
+        """Initialize all db tables.
+
+        Names of tables are selected from schema if they are not passed.
+        """
+        if names is None:
+            names = self.schema_table_names()
+
+        custom_table_names = set()
+        for attr in filter(
+            lambda i: not i.startswith("_"),
+            dir(self.__class__),
+        ):
+            custom_table = getattr(self, attr)
+            if not isinstance(custom_table, Table):
+                continue
+            custom_table_names.add(custom_table.name.lower())
+            custom_table(self)
+
+        for name in names:
+            table_name = name.lower()
+            self.table_names.add(table_name)
+            if table_name in custom_table_names:
+                continue
+            new_table = Table(name, use_datacls=self.use_datacls)
+            new_table(self)
+            setattr(self, table_name, new_table)
+        if hasattr(self, "tables"):
+            del self.tables
+
+    def initialize_db(self) -> list[str]:
+        """Create all tables in one transaction, return their names."""
+        names: list[str] = []
+
+        def create_table(name: str, *args: Any, **kwargs: Any) -> None:
+            names.append(name)
+            self.create_table(name, *args, init_tables=False, **kwargs)
+
+        with self.batch():
+            create_table(
+                "Rate",
+                {
+                    "id": Integer(primary_key=True),
+                    "name": Text(default=""),
+                    "value": Integer(default=0),
+                    "by_default": Real(default=0),  # type: ignore
+                    "type": Text(default="shift"),
+                    "hours": Integer(default=8),
+                    "state": Integer(default=1),
+                }
             )
-        )
-        self.create_table(
-            "Setting",
-            {
-                "key": Text(primary_key=True),
-                "value": Text(),
-            },
-        )
+            create_table(
+                "Bonus",
+                {
+                    "id": Integer(primary_key=True),
+                    "name": Text(default=""),
+                    "value": Integer(default=0),
+                    "by_default": Real(default=0),  # type: ignore
+                    "state": Integer(default=1),
+                    "type": Text(default="fix"),
+                }
+            )
+            create_table(
+                "Rework",
+                {
+                    "id": Integer(primary_key=True),
+                    "value": Integer(default=0),
+                    "type": Text(default="fix"),
+                }
+            )
+            create_table(
+                "Work",
+                {
+                    "id": Integer(primary_key=True),
+                    "name": Text(default=""),
+                    "start_datetime": Text(),
+                    "end_datetime": Text(),
+                    "hours": Integer(),
+                    "rate_id": Integer(),
+                    "rework_id": Integer(nullable=True),
+                    "value": Integer(),
+                    "json": Text(),
+                    "state": Integer(default=1),
+                    "description": Text(default="")
+                },
+                foreign_keys=(
+                    ForeignKey("rate_id", "Rate", "id"),
+                    ForeignKey("rework_id", "Rework", "id"),
+                )
+            )
+            create_table(
+                "Work_Bonus",
+                {
+                    "work_id": Integer(),
+                    "bonus_id": Integer(),
+                    "on_full_sum": Integer(default=0),
+                },
+                foreign_keys=(
+                    ForeignKey("work_id", "Work", "id", on_delete="cascade"),
+                    ForeignKey("bonus_id", "Bonus", "id", on_delete="cascade"),
+                )
+            )
+            create_table(
+                "Work_Month",
+                {
+                    "year": Text(),
+                    "month": Text(),
+                    "works": Integer(),
+                },
+                table_primary_key=("year", "month"),
+            )
+            create_table(
+                "Work_Breakdown",
+                {
+                    "work_id": Integer(),
+                    "position": Integer(),
+                    "name": Text(),
+                    "type": Text(),
+                    "money": Integer(),
+                },
+                table_primary_key=("work_id", "position"),
+            )
+            create_table(
+                "Other_Income",
+                {
+                    "work_id": Integer(),
+                    "position": Integer(),
+                    "name": Text(default=""),
+                    "value": Integer(default=0),
+                },
+                table_primary_key=("work_id", "position"),
+                foreign_keys=(
+                    ForeignKey("work_id", "Work", "id", on_delete="cascade"),
+                ),
+            )
+            create_table(
+                "Setting",
+                {
+                    "key": Text(primary_key=True),
+                    "value": Text(),
+                },
+            )
+        return names
 
-    def migrations(self) -> None:
-        """Migrations for data base."""
-        migrations = (
-            "ALTER TABLE Work ADD COLUMN description TEXT NOT NULL DEFAULT ''",
-            "ALTER TABLE Work ADD COLUMN json TEXT NOT NULL DEFAULT ''",
-            "ALTER TABLE Bonus ADD COLUMN type TEXT NOT NULL DEFAULT 'fix'",
-            (
-                "ALTER TABLE Work_Bonus ADD COLUMN on_full_sum "
-                "INTEGER NOT NULL DEFAULT 0"
-            ),
-            (
-                "ALTER TABLE Work ADD COLUMN state "
-                "INTEGER NOT NULL DEFAULT 0"
-            ),
-            "ALTER TABLE Work ADD COLUMN rework_id INTEGER NULL;"
-        )
+    @property
+    def version(self) -> int:
+        """Return number of applied migrations."""
+        return self.execute(  # type: ignore
+            "PRAGMA user_version",
+            result=ResultFetch.fetchone,
+        )[0]
 
-        for query in migrations:
-            try:
-                self.execute(query)
-            except OperationalError:
-                pass
+    def migrations(self) -> None:
+        """Apply pending migrations in one transaction."""
+        pending = MIGRATIONS[self.version:]
+        if not pending:
+            return
+        with self.batch():
+            for migration in pending:
+                migration(self)
+            self.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
 
     def execute(
         self,
@@ -162,7 +328,8 @@ class DataBase(DB):
         many: bool = False,
         size: int | None = None,
         result: ResultFetch | None = None,
-    ) -> list[Any] | None:
+        lastrowid: bool = False,
+    ) -> list[Any] | int | None:
         """Single execute to simplify it.
 
         Args:
@@ -172,12 +339,15 @@ class DataBase(DB):
             many (bool): flag for executemany operation. Defaults to False.
             size (int | None): size for fetchmany operation. Defaults to None.
             result (ResultFetch | None): enum for fetch func. Defaults to None.
+            lastrowid (bool): return id of inserted row. Defaults to False.
 
         Returns:
-            list[Any] or None
+            list[Any], int or None
 
         """
         command = query.partition(" ")[0].lower()
+        self.statements.register(query)
+        begin = perf_counter()
         cursor = self.connect.cursor()
         if many:
             cursor.executemany(query, parameters)
@@ -191,20 +361,143 @@ class DataBase(DB):
             "create",
             "drop",
             "alter",
-        }:
+        } and not self.batch_depth:
             self.connect.commit()
 
-        # Check result
-        if result is None:
-            return None
+        value: list[Any] | int | None = None
+        rows = max(cursor.rowcount, 0)
+        if lastrowid:
+            value = cursor.lastrowid
+        elif result is not None:
+            ResultFetch(result)
+            result_func: Callable = getattr(cursor, result.value)
+            if result.value == "fetchmany":
+                value = result_func(size=size)
+            else:
+                value = result_func()
+            if isinstance(value, list):
+                rows = len(value)
+            else:
+                rows = int(value is not None)
+
+        self.register_query(
+            query,
+            parameters,
+            perf_counter() - begin,
+            rows,
+            explain=not many and command in EXPLAINED_COMMANDS,
+        )
+        return value
+
+    def register_query(
+        self,
+        query: str,
+        parameters: MutableMapping | Sequence,
+        elapsed: float,
+        rows: int,
+        *,
+        explain: bool = False,
+    ) -> None:
+        """Register query in stats, log slow query.
+
+        Caller is searched only if queries are traced, plan of slow
+        query is always explained.
+        """
+        trace = self.queries.trace
+        caller = self.find_caller() if trace else ""
+        self.queries.register(query, elapsed, rows, caller)
+        if not self.queries.is_slow(elapsed):
+            return
+        plan = self.explain(query, parameters) if explain else []
+        self.queries.register_slow(query, elapsed, caller, plan)
+        logger.warning(
+            "Slow query %.1f ms in %s: %s\n%s",
+            elapsed * 1000,
+            caller or "-",
+            query,
+            "\n".join(plan),
+        )
+
+    @staticmethod
+    def find_caller() -> str:
+        """Return first function outside db packages which runs query."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if not module.startswith(INTERNAL_PACKAGES):
+                code = frame.f_code
+                # co_qualname exists since python 3.11
+                return "{}.{}".format(
+                    module.rpartition(".")[2],
+                    getattr(code, "co_qualname", code.co_name),
+                )
+            frame = frame.f_back  # type: ignore
+        return "unknown"
+
+    def explain(
+        self,
+        query: str,
+        parameters: MutableMapping | Sequence = (),
+    ) -> list[str]:
+        """Return lines of query plan, it is not registered in stats."""
+        try:
+            plan = self.execute_direct(
+                f"EXPLAIN QUERY PLAN {query}",
+                parameters,
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+        return [row[3] for row in plan]
+
+    def execute_direct(
+        self,
+        query: str,
+        parameters: MutableMapping | Sequence = (),
+    ) -> sqlite3.Cursor:
+        """Execute service query without auto-commit and query stats.
+
+        Statement is registered, it takes place in statement cache.
+        """
+        self.statements.register(query)
+        return self.connect.execute(query, parameters)
+
+    def stored_slow_query_ms(self) -> float:
+        """Return slow query threshold saved in settings."""
+        return self.store.get_float("slow_query_ms", DEFAULT_SLOW_QUERY_MS)
 
-        ResultFetch(result)
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Suspend auto-commit and commit all queries once at the end.
 
-        result_func: Callable = getattr(cursor, result.value)
+        Nested batch is a savepoint, so its error rolls back only
+        queries of this nested batch.
+        """
+        if self.batch_depth:
+            savepoint = f"batch_{self.batch_depth}"
+            self.execute_direct(f"SAVEPOINT {savepoint}")
+            self.batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self.execute_direct(f"ROLLBACK TO {savepoint}")
+                raise
+            finally:
+                self.batch_depth -= 1
+                self.execute_direct(f"RELEASE {savepoint}")
+            return
 
-        if result.value == "fetchmany":
-            return result_func(size=size)
-        return result_func()
+        if not self.connect.in_transaction:
+            self.execute_direct("BEGIN")
+        self.batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self.connect.rollback()
+            raise
+        else:
+            self.connect.commit()
+        finally:
+            self.batch_depth -= 1
 
     if TYPE_CHECKING:
         def __getattr__(self, name: str) -> "Table":
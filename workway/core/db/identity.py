@@ -0,0 +1,91 @@
+"""Module contain identity map of table rows."""
+from __future__ import annotations
+
+from typing import Any
+from weakref import WeakValueDictionary
+
+
+__all__ = (
+    "IdentityMap",
+)
+
+
+class IdentityMap:
+    """Weak map of row objects by table name and primary key.
+
+    Row is kept while it is used somewhere, so every code path gets the
+    same object of entity. Rows with not saved changes are not returned,
+    they belong to code which changes them.
+    """
+
+    __slots__ = ("_rows", "hits", "misses", "reused", "invalidations")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._rows: dict[str, WeakValueDictionary[int, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        self.invalidations = 0
+
+    def find(self, table: str, id_: int) -> Any | None:
+        """Return clean row of table by id without counting."""
+        rows = self._rows.get(table)
+        if rows is None:
+            return None
+        row = rows.get(id_)
+        if row is None or row.changed_columns:
+            return None
+        return row
+
+    def get(self, table: str, id_: int) -> Any | None:
+        """Return clean row of table by id, count hit or miss."""
+        row = self.find(table, id_)
+        if row is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return row
+
+    def add(self, table: str, row: Any) -> Any:
+        """Remember row and return it."""
+        rows = self._rows.get(table)
+        if rows is None:
+            rows = self._rows[table] = WeakValueDictionary()
+        rows[row.id] = row
+        return row
+
+    def invalidate(self, table: str, id_: int | None = None) -> None:
+        """Forget row of table by id or all rows of table."""
+        rows = self._rows.get(table)
+        if not rows:
+            return
+        self.invalidations += 1
+        if id_ is None:
+            rows.clear()
+        else:
+            rows.pop(id_, None)
+
+    def clear(self) -> None:
+        """Forget all rows."""
+        self._rows.clear()
+
+    def reset(self) -> None:
+        """Reset counters."""
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict."""
+        return {
+            "size": {
+                table: len(rows)
+                for table, rows in self._rows.items()
+            },
+            "hits": self.hits,
+            "misses": self.misses,
+            "reused": self.reused,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,237 @@
+"""Module contain versioned data base migrations.
+
+Migration number is its index in MIGRATIONS plus one, applied number is
+stored in 'PRAGMA user_version'. Add new migrations only to the end.
+"""
+from __future__ import annotations
+
+import json
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+from typing import Callable
+
+from lildb.enumcls import ResultFetch
+
+from workway.money import to_cents
+
+
+if TYPE_CHECKING:
+    from .db import DataBase
+
+
+__all__ = (
+    "MIGRATIONS",
+)
+
+
+def add_legacy_columns(db: DataBase) -> None:
+    """Add columns which were added before versioned migrations.
+
+    Db may already contain some of them, so errors are ignored.
+    """
+    migrations = (
+        "ALTER TABLE Work ADD COLUMN description TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE Work ADD COLUMN json TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE Bonus ADD COLUMN type TEXT NOT NULL DEFAULT 'fix'",
+        (
+            "ALTER TABLE Work_Bonus ADD COLUMN on_full_sum "
+            "INTEGER NOT NULL DEFAULT 0"
+        ),
+        (
+            "ALTER TABLE Work ADD COLUMN state "
+            "INTEGER NOT NULL DEFAULT 0"
+        ),
+        "ALTER TABLE Work ADD COLUMN rework_id INTEGER NULL;",
+    )
+
+    for query in migrations:
+        try:
+            db.execute(query)
+        except OperationalError:
+            pass
+
+
+def create_datetime_indexes(db: DataBase) -> None:
+    """Index work datetimes for month range queries."""
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS work_start_datetime_idx "
+        "ON Work (start_datetime)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS work_end_datetime_idx "
+        "ON Work (end_datetime)"
+    )
+
+
+def create_work_month(db: DataBase) -> None:
+    """Create triggers which keep Work_Month in sync with Work and fill it.
+
+    Every work is counted once in the month it starts and once in
+    the month it ends, if that month is another one.
+    """
+    increment = (
+        "INSERT INTO Work_Month (year, month, works) "
+        "SELECT substr(NEW.{0}, 1, 4), substr(NEW.{0}, 6, 2), 1 "
+        "WHERE {1} "
+        "ON CONFLICT (year, month) DO UPDATE SET works = works + 1;"
+    )
+    decrement = (
+        "UPDATE Work_Month SET works = works - 1 "
+        "WHERE year = substr(OLD.{0}, 1, 4) "
+        "AND month = substr(OLD.{0}, 6, 2) AND {1};"
+    )
+    new_other_month = (
+        "substr(NEW.end_datetime, 1, 7) != "
+        "substr(NEW.start_datetime, 1, 7)"
+    )
+    old_other_month = new_other_month.replace("NEW.", "OLD.")
+    insert_body = (
+        increment.format("start_datetime", "1") +
+        increment.format("end_datetime", new_other_month)
+    )
+    delete_body = (
+        decrement.format("start_datetime", "1") +
+        decrement.format("end_datetime", old_other_month) +
+        "DELETE FROM Work_Month WHERE works <= 0;"
+    )
+    triggers = (
+        (
+            "CREATE TRIGGER IF NOT EXISTS work_month_insert "
+            f"AFTER INSERT ON Work BEGIN {insert_body} END"
+        ),
+        (
+            "CREATE TRIGGER IF NOT EXISTS work_month_delete "
+            f"AFTER DELETE ON Work BEGIN {delete_body} END"
+        ),
+        (
+            "CREATE TRIGGER IF NOT EXISTS work_month_update "
+            "AFTER UPDATE OF start_datetime, end_datetime ON Work "
+            f"BEGIN {delete_body}{insert_body} END"
+        ),
+    )
+    for query in triggers:
+        db.execute(query)
+
+    filled = db.execute(
+        "SELECT EXISTS (SELECT 1 FROM Work_Month)",
+        result=ResultFetch.fetchone,
+    )
+    if filled[0]:  # type: ignore
+        return
+    db.execute(
+        "INSERT INTO Work_Month (year, month, works) "
+        "SELECT substr(dttm, 1, 4), substr(dttm, 6, 2), count(*) "
+        "FROM ("
+        "SELECT start_datetime AS dttm FROM Work "
+        "UNION ALL "
+        "SELECT end_datetime FROM Work "
+        "WHERE substr(end_datetime, 1, 7) != substr(start_datetime, 1, 7)"
+        ") GROUP BY 1, 2"
+    )
+
+
+def create_relation_indexes(db: DataBase) -> None:
+    """Index relation columns for prefetch and recalculation."""
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS work_bonus_work_id_idx "
+        "ON Work_Bonus (work_id)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS work_bonus_bonus_id_idx "
+        "ON Work_Bonus (bonus_id)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS work_rate_id_idx "
+        "ON Work (rate_id)"
+    )
+
+
+def money_to_cents(db: DataBase) -> None:
+    """Store money and percents like integer hundredths.
+
+    Column type can not be changed, so column is replaced with new
+    integer column. New db already has integer columns.
+    """
+    columns = (
+        ("Rate", "value"),
+        ("Bonus", "value"),
+        ("Rework", "value"),
+        ("Work", "value"),
+        ("Work_Breakdown", "money"),
+    )
+    converted = set()
+    for table, column in columns:
+        type_ = db.execute(
+            "SELECT type FROM PRAGMA_TABLE_INFO(?) WHERE name = ?",
+            (table, column),
+            result=ResultFetch.fetchone,
+        )
+        if type_ is None or type_[0].upper() == "INTEGER":
+            continue
+        converted.add(table)
+        queries = (
+            f"ALTER TABLE {table} ADD COLUMN {column}_cents "
+            "INTEGER NOT NULL DEFAULT 0",
+            f"UPDATE {table} SET {column}_cents = "
+            f"CAST(ROUND({column} * 100) AS INTEGER)",
+            f"ALTER TABLE {table} DROP COLUMN {column}",
+            f"ALTER TABLE {table} RENAME COLUMN {column}_cents TO {column}",
+        )
+        for query in queries:
+            db.execute(query)
+    if "Work" not in converted:
+        return
+
+    # other income is stored in json of work
+    works = []
+    for id_, json_data in db.execute(  # type: ignore
+        "SELECT id, json FROM Work WHERE json != ''",
+        result=ResultFetch.fetchall,
+    ):
+        data = json.loads(json_data)
+        if not data.get("other_income"):
+            continue
+        for income in data["other_income"]:
+            income["value"] = to_cents(income["value"])
+        works.append((json.dumps(data), id_))
+    if works:
+        db.execute("UPDATE Work SET json = ? WHERE id = ?", works, many=True)
+
+
+def move_other_income(db: DataBase) -> None:
+    """Move other income from json of work to Other_Income table.
+
+    Table is created by initialize_db, primary key (work_id, position)
+    indexes it by work.
+    """
+    rows = []
+    for id_, json_data in db.execute(  # type: ignore
+        "SELECT id, json FROM Work WHERE json LIKE '%other_income%'",
+        result=ResultFetch.fetchall,
+    ):
+        try:
+            data = json.loads(json_data)
+        except ValueError:
+            continue
+        rows.extend(
+            (id_, position, income.get("name") or "", int(income["value"]))
+            for position, income in enumerate(data.get("other_income") or ())
+        )
+    if rows:
+        db.execute(
+            "INSERT INTO Other_Income "
+            "(work_id, position, name, value) VALUES (?, ?, ?, ?)",
+            rows,
+            many=True,
+        )
+    db.execute("UPDATE Work SET json = '{}' WHERE json != '{}'")
+
+
+MIGRATIONS: tuple[Callable[[DataBase], None], ...] = (
+    add_legacy_columns,
+    create_datetime_indexes,
+    create_work_month,
+    create_relation_indexes,
+    money_to_cents,
+    move_other_income,
+)
@@ -1,11 +1,15 @@
 
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Iterable
 from typing import MutableMapping
 from typing import Sequence
 
 from lildb.column_types import BaseType
 from lildb.operations import CreateTable
+from lildb.operations import Delete
+from lildb.operations import Insert
+from lildb.operations import Select
 from lildb.operations import Update
 
 from .column import ForeignKey
@@ -14,6 +18,7 @@ from .column import ForeignKey
 if TYPE_CHECKING:
     from lildb.operations import TOperator
     from lildb.operations import TQueryData
+    from lildb.rows import TRow
 
 
 class CreateTable(CreateTable):
@@ -27,6 +32,7 @@ class CreateTable(CreateTable):
         foreign_keys: Sequence[ForeignKey] | None = None,
         *,
         if_not_exists: bool = True,
+        init_tables: bool = True,
     ) -> None:
         """Create table in DB.
 
@@ -38,6 +44,8 @@ class CreateTable(CreateTable):
             Defaults to None.
             if_not_exists (bool): use 'if not exists' in query.
             Defaults to True.
+            init_tables (bool): reinitialize db tables after creating.
+            Defaults to True.
 
         Raises:
             TypeError: Incorrect type for columns
@@ -71,7 +79,8 @@ class CreateTable(CreateTable):
             columns_query = ", ".join(columns)
             query = f"{query}({columns_query}{primary_key})"
             self.db.execute(query)
-            self.db.initialize_tables()
+            if init_tables:
+                self.db.initialize_tables()
             return
 
         if (
@@ -89,7 +98,127 @@ class CreateTable(CreateTable):
         query = f"{query} ({columns_query}{primary_key})"
 
         self.db.execute(query)
-        self.db.initialize_tables()
+        if init_tables:
+            self.db.initialize_tables()
+
+
+class InsertFixed(Insert):
+    """Return id of inserted row."""
+
+    def __call__(
+        self,
+        data: "TQueryData | Sequence[TQueryData]",
+    ) -> int | None:
+        """Insert-query for current table.
+
+        Single row is inserted with execute and its id is returned,
+        sequence of rows is inserted with executemany.
+        """
+        if not data:
+            msg = "Data do not be empty."
+            raise ValueError(msg)
+        if isinstance(data, dict):
+            return self.table.execute(  # type: ignore
+                self.query((data,)),
+                data,
+                lastrowid=True,
+            )
+        self.table.execute(self.query(data), data, many=True)
+        return None
+
+
+class SelectFixed(Select):
+    """With bound condition parameters and batch loading of relations."""
+
+    def __call__(
+        self,
+        *,
+        size: int = 0,
+        columns: Iterable[str] | None = None,
+        condition: str | None = None,
+        parameters: MutableMapping | Sequence = (),
+        prefetch: Sequence[str] = (),
+        **kwargs: Any,
+    ) -> list["TRow"]:
+        """Select-query for current table.
+
+        Args:
+            size (int): size for fetchmany operation. Defaults to 0.
+            columns (Iterable[str] | None): selected columns.
+            Defaults to None.
+            condition (str | None): sql condition. Defaults to None.
+            parameters (MutableMapping | Sequence): bound parameters for
+            condition. Defaults to ().
+            prefetch (Sequence[str]): relation names which will be loaded
+            for all selected rows at once. Defaults to ().
+            **kwargs (Any): arguments of base select.
+
+        Raises:
+            ValueError: bound parameters without condition or with
+            filter arguments, they would be ignored.
+
+        """
+        if parameters and (kwargs or not condition):
+            msg = "Argument 'parameters' needs 'condition' without filters."
+            raise ValueError(msg)
+        if condition and parameters:
+            query = f"{self.query(columns)} WHERE {condition}"
+            rows = self._execute(
+                query,
+                parameters,  # type: ignore
+                size=size,
+                columns=columns,
+            )
+        else:
+            rows = super().__call__(
+                size=size,
+                columns=columns,
+                condition=condition,
+                **kwargs,
+            )
+        if prefetch and rows and not columns:
+            self.table.prefetch(rows, prefetch)  # type: ignore
+        return rows
+
+    def _as_list_row(
+        self,
+        items: Iterable[tuple[Any, ...]],
+        *,
+        columns: Iterable[str] | None = None,
+    ) -> list["TRow"]:
+        """Create rows, known rows of identity map are reused."""
+        if columns or not getattr(self.table, "uses_identity", False):
+            return super()._as_list_row(items, columns=columns)  # type: ignore
+
+        identity = self.table.db.identity
+        name = self.table.name
+        row_cls = self.table.row_cls
+        column_names = self.table.column_names
+        rows = []
+        for item in items:
+            values = dict(zip(column_names, item))
+            row = identity.find(name, values["id"])
+            if row is None:
+                row = identity.add(name, row_cls(table=self.table, **values))
+            else:
+                identity.reused += 1
+                refresh_row(row, values)
+            rows.append(row)
+        return rows
+
+
+def refresh_row(row: "TRow", values: MutableMapping[str, Any]) -> None:
+    """Set values of columns without change tracking.
+
+    Prefetched relations are dropped if any value is changed.
+    """
+    changed = False
+    for name, value in values.items():
+        if getattr(row, name) != value:
+            object.__setattr__(row, name, value)
+            changed = True
+    if changed and getattr(row, "prefetched", None):
+        row.prefetched.clear()  # type: ignore
 
 
 class UpdateFixed(Update):
@@ -101,6 +230,7 @@ class UpdateFixed(Update):
         *,
         without_parameters: bool = False,
         null_is: bool = True,
+        prefix: str = "",
     ) -> str:
         if operator.lower() not in {"and", "or", ","}:
             msg = "Incorrect operator."
@@ -110,7 +240,7 @@ class UpdateFixed(Update):
             return f" {operator} ".join(
                 f"{key} is NULL"
                 if value is None and null_is
-                else f"{key} = :{key}"
+                else f"{key} = :{prefix}{key}"
                 for key, value in data.items()
             )
 
@@ -142,16 +272,42 @@ class UpdateFixed(Update):
             operator=",",
             null_is=False,
         )
+        # Filter values are bound too, so the statement is reused
+        # by sqlite3 statement cache for any row.
+        where = {
+            f"where_{key}": value
+            for key, value in filter_by.items()
+        }
         query_operator = self._make_operator_query(
             filter_by,
             operator,
-            without_parameters=True,
+            prefix="where_",
         )
         query = self.query + query_coma
         if filter_by:
             query = f"{query} WHERE {query_operator}"
+            self.table.execute(query, {**data, **where})  # type: ignore
+        else:
+            if condition:
+                query = f"{query} WHERE {condition}"
             self.table.execute(query, data)  # type: ignore
-            return
-        if condition:
-            query = f"{query} WHERE {condition}"
-        self.table.execute(query, data)  # type: ignore
+        self.table.db.identity.invalidate(
+            self.table.name,
+            filter_by.get("id"),
+        )
+
+
+class DeleteFixed(Delete):
+    """Forget deleted rows in identity map."""
+
+    def __call__(
+        self,
+        id: int | Iterable[int] | None = None,  # noqa: A002
+        **kwargs: Any,
+    ) -> None:
+        """Delete-query for current table."""
+        super().__call__(id, **kwargs)
+        self.table.db.identity.invalidate(
+            self.table.name,
+            id if isinstance(id, int) else None,
+        )
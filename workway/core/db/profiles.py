@@ -0,0 +1,53 @@
+"""Module contain sqlite performance profiles."""
+from enum import Enum
+
+
+__all__ = (
+    "DEFAULT_PROFILE",
+    "PROFILES",
+    "ProfileName",
+)
+
+
+class ProfileName(Enum):
+    """Profile enum names."""
+
+    default = "Стандартный"
+    fast = "Быстрый"
+    safe = "Надёжный"
+
+
+DEFAULT_PROFILE = "default"
+
+# Every profile sets all pragmas, because journal_mode is stored in db
+# file and must be reverted when profile is switched.
+PROFILES: dict[str, dict[str, str | int]] = {
+    # sqlite defaults
+    "default": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "foreign_keys": "OFF",
+    },
+    # WAL without fsync on every commit, db can lose last commits
+    # on power loss but never becomes corrupted
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    # WAL with fsync on every commit
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -8000,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
@@ -0,0 +1,202 @@
+"""Module contain db statistics components."""
+from __future__ import annotations
+
+from collections import Counter
+from collections import OrderedDict
+from collections import deque
+
+
+__all__ = (
+    "QueryStats",
+    "StatementStats",
+)
+
+
+class StatementStats:
+    """Mirror of sqlite3 statement cache for prepare and reuse counters.
+
+    sqlite3 keeps compiled statements in LRU cache keyed by sql text with
+    'cached_statements' size, so the same LRU is replayed here. It is an
+    estimate, sqlite3 does not expose its counters. Only 'prepares_size'
+    statements with the most prepares are kept.
+    """
+
+    __slots__ = (
+        "size",
+        "prepares_size",
+        "prepared",
+        "reused",
+        "prepares",
+        "_statements",
+    )
+
+    def __init__(self, size: int, *, prepares_size: int = 500) -> None:
+        """Initialize."""
+        self.size = size
+        self.prepares_size = prepares_size
+        self.prepared = 0
+        self.reused = 0
+        self.prepares: Counter[str] = Counter()
+        self._statements: OrderedDict[str, None] = OrderedDict()
+
+    def register(self, query: str) -> bool:
+        """Register executed query, return True if statement is reused."""
+        if query in self._statements:
+            self._statements.move_to_end(query)
+            self.reused += 1
+            return True
+
+        self.prepared += 1
+        self.prepares[query] += 1
+        if len(self.prepares) > self.prepares_size:
+            # trimmed once per half of size, not on every statement
+            self.prepares = Counter(dict(
+                self.prepares.most_common(self.prepares_size // 2),
+            ))
+        if self.size <= 0:
+            return False
+        self._statements[query] = None
+        if len(self._statements) > self.size:
+            self._statements.popitem(last=False)
+        return False
+
+    def reset(self) -> None:
+        """Reset counters."""
+        self.prepared = 0
+        self.reused = 0
+        self.prepares.clear()
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict."""
+        return {
+            "estimated": True,
+            "cached_statements": self.size,
+            "prepared": self.prepared,
+            "reused": self.reused,
+            "prepares": dict(self.prepares.most_common()),
+        }
+
+
+class QueryRecord:
+    """Counters of one sql statement."""
+
+    __slots__ = ("count", "total", "rows", "timings", "callers")
+
+    def __init__(self, window: int) -> None:
+        """Initialize."""
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.timings: deque[float] = deque(maxlen=window)
+        self.callers: Counter[str] = Counter()
+
+    def percentile(self, percent: float) -> float:
+        """Return percentile of kept timings in seconds."""
+        if not self.timings:
+            return 0.0
+        timings = sorted(self.timings)
+        return timings[round((len(timings) - 1) * percent / 100)]
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict, timings are in milliseconds."""
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "rows": self.rows,
+            "callers": dict(self.callers.most_common()),
+        }
+
+
+class QueryStats:
+    """Timings, returned rows and callers of executed queries.
+
+    Percentiles are calculated by last 'window' timings of statement
+    and only 'size' recently executed statements are kept, so long
+    session does not grow memory. Queries slower than 'slow_ms' are
+    kept with query plan, zero disables it. Callers are searched only
+    with 'trace', it is not free.
+    """
+
+    __slots__ = ("window", "size", "slow_ms", "trace", "slow", "_queries")
+
+    def __init__(
+        self,
+        slow_ms: float = 100,
+        *,
+        trace: bool = False,
+        window: int = 1000,
+        size: int = 500,
+        slow_size: int = 50,
+    ) -> None:
+        """Initialize."""
+        self.window = window
+        self.size = size
+        self.slow_ms = slow_ms
+        self.trace = trace
+        self.slow: deque[dict] = deque(maxlen=slow_size)
+        self._queries: OrderedDict[str, QueryRecord] = OrderedDict()
+
+    def is_slow(self, elapsed: float) -> bool:
+        """Return True if query with elapsed seconds is slow."""
+        return 0 < self.slow_ms <= elapsed * 1000
+
+    def register(
+        self,
+        query: str,
+        elapsed: float,
+        rows: int,
+        caller: str,
+    ) -> None:
+        """Register executed query with elapsed seconds."""
+        record = self._queries.get(query)
+        if record is None:
+            record = self._queries[query] = QueryRecord(self.window)
+            if len(self._queries) > self.size:
+                self._queries.popitem(last=False)
+        else:
+            self._queries.move_to_end(query)
+        record.count += 1
+        record.total += elapsed
+        record.rows += rows
+        record.timings.append(elapsed)
+        if caller:
+            record.callers[caller] += 1
+
+    def register_slow(
+        self,
+        query: str,
+        elapsed: float,
+        caller: str,
+        plan: list[str],
+    ) -> None:
+        """Keep slow query with its query plan."""
+        self.slow.append({
+            "query": query,
+            "ms": elapsed * 1000,
+            "caller": caller,
+            "plan": plan,
+        })
+
+    def reset(self) -> None:
+        """Reset counters."""
+        self.slow.clear()
+        self._queries.clear()
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict, slowest by total time first."""
+        queries = sorted(
+            self._queries.items(),
+            key=lambda item: item[1].total,
+            reverse=True,
+        )
+        return {
+            "slow_ms": self.slow_ms,
+            "trace": self.trace,
+            "queries": {
+                query: record.as_dict()
+                for query, record in queries
+            },
+            "slow": list(self.slow),
+        }
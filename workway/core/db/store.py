@@ -0,0 +1,74 @@
+"""Module contain key-value store of settings."""
+from __future__ import annotations
+
+from sqlite3 import OperationalError
+from typing import TYPE_CHECKING
+
+from lildb.enumcls import ResultFetch
+
+
+if TYPE_CHECKING:
+    from .db import DataBase
+
+
+__all__ = (
+    "SettingStore",
+)
+
+
+class SettingStore:
+    """Settings of Setting table kept in memory.
+
+    All settings are loaded by one query, reads are served from memory
+    and writes go to db with upsert.
+    """
+
+    __slots__ = ("db", "_values")
+
+    def __init__(self, db: "DataBase") -> None:
+        """Initialize."""
+        self.db = db
+        self._values: dict[str, str] = {}
+
+    def load(self) -> None:
+        """Load all settings, db without Setting table has no settings."""
+        try:
+            rows = self.db.execute(
+                "SELECT key, value FROM Setting",
+                result=ResultFetch.fetchall,
+            )
+        except OperationalError:
+            rows = []
+        self._values = dict(rows)  # type: ignore
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        """Return value of setting."""
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, default: int) -> int:
+        """Return value of setting like int."""
+        try:
+            return int(self._values[key])
+        except (KeyError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float) -> float:
+        """Return value of setting like float."""
+        try:
+            return float(self._values[key])
+        except (KeyError, ValueError):
+            return default
+
+    def set(self, key: str, value: object) -> None:
+        """Save value of setting like text."""
+        value = str(value)
+        self.db.execute(
+            "INSERT INTO Setting (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+        self._values[key] = value
+
+    def as_dict(self) -> dict[str, str]:
+        """Return copy of all settings."""
+        return dict(self._values)
@@ -1,17 +1,25 @@
 """Module contains tables cls."""
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
 from enum import Enum
+from typing import Iterable
+from typing import Sequence
 
 from lildb import Table
+from lildb.enumcls import ResultFetch
+from lildb.rows import TRow
 from lildb.rows import _RowDataClsMixin
 
+from workway.money import format_cents
+from workway.typings import TCompleteBonus
 from workway.typings import TCompleteOtherIncome
 
+from .operation import DeleteFixed
+from .operation import InsertFixed
+from .operation import SelectFixed
 from .operation import UpdateFixed
 
 
@@ -20,22 +28,64 @@ __all__ = (
     "RateRow",
     "BonusTable",
     "BonusRow",
+    "ReworkTable",
+    "ReworkRow",
+    "WorkTable",
+    "WorkRow",
 )
 
 
+# Max count of ids in one 'IN (...)' statement
+IN_CHUNK_SIZE = 512
+
+
+def chunked_ids(ids: Iterable[int]) -> Iterable[tuple[str, list[int]]]:
+    """Split ids to chunks with placeholders for 'IN (...)'.
+
+    Chunk is padded with the last id up to power of two, so only a few
+    distinct statements exist and they are reused from statement cache.
+    """
+    ids = sorted({int(id_) for id_ in ids if id_ is not None})
+    for index in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[index:index + IN_CHUNK_SIZE]
+        size = 1
+        while size < len(chunk):
+            size *= 2
+        chunk += [chunk[-1]] * (size - len(chunk))
+        yield ", ".join("?" * size), chunk
+
+
+class IdentityTableMixin:
+    """Table with rows in identity map of db, rows are got by id from it.
+
+    Row cls must support weak references.
+    """
+
+    uses_identity = True
+
+    def get(self, **filter_by: str | int) -> TRow | None:
+        """Get one row by filter, row by id is taken from memory."""
+        if filter_by.keys() == {"id"}:
+            if filter_by["id"] is None:
+                return None
+            row = self.db.identity.get(  # type: ignore
+                self.name,  # type: ignore
+                filter_by["id"],
+            )
+            if row is not None:
+                return row
+        return super().get(**filter_by)  # type: ignore
+
+
 class PretifyMoneyMixin:
     """Pretify money."""
 
-    value: float
+    value: int
 
     @property
     def pretify_money(self) -> str:
         """Prepare string money."""
-        money = str(round(self.value, 2))
-        total, cent = money.split(".")
-        if cent == "0":
-            money = total
-        return f"{money} руб."
+        return f"{format_cents(self.value)} руб."
 
 
 class TypeMixin:
@@ -63,7 +113,7 @@ class RateRow(_RowDataClsMixin, PretifyMoneyMixin, TypeMixin):
     id: int
     by_default: bool
     name: str
-    value: float
+    value: int
     type: str
     hours: int
     state: int
@@ -79,12 +129,15 @@ class RateRow(_RowDataClsMixin, PretifyMoneyMixin, TypeMixin):
         return bool(self.by_default)
 
 
-class RateTable(Table):
+class RateTable(IdentityTableMixin, Table):
     """Rage table."""
 
     row_cls = RateRow
 
+    select = SelectFixed
+    insert = InsertFixed
     update = UpdateFixed
+    delete = DeleteFixed
 
 
 class BonusType(Enum):
@@ -100,7 +153,7 @@ class BonusRow(_RowDataClsMixin, TypeMixin):
     id: int
     by_default: bool
     name: str
-    value: float
+    value: int
     state: int
     type: str
 
@@ -117,21 +170,44 @@ class BonusRow(_RowDataClsMixin, TypeMixin):
     @property
     def pretify_money(self) -> str:
         """Prepare string money."""
-        money = str(self.value)
-        total, cent = money.split(".")
-        if cent == "0":
-            money = total
+        money = format_cents(self.value)
         if self.type == "fix":
             return f"{money} руб."
         return f"{money} %"
 
 
-class BonusTable(Table):
+class BonusTable(IdentityTableMixin, Table):
     """Bonus table."""
 
     row_cls = BonusRow
 
+    select = SelectFixed
+    insert = InsertFixed
     update = UpdateFixed
+    delete = DeleteFixed
+
+
+@dataclass(slots=True)
+class ReworkRow(_RowDataClsMixin):
+
+    id: int
+    value: int
+    type: str
+
+    # Required fields for row-cls
+    table: Table
+    changed_columns: set = field(default_factory=lambda: set())  # type: ignore
+
+
+class ReworkTable(Table):
+    """Rework table."""
+
+    row_cls = ReworkRow
+
+    select = SelectFixed
+    insert = InsertFixed
+    update = UpdateFixed
+    delete = DeleteFixed
 
 
 @dataclass(slots=True)
@@ -145,12 +221,14 @@ class WorkRow(_RowDataClsMixin, PretifyMoneyMixin):
     rate_id: int
     rework_id: int
     state: int
-    value: float
+    value: int
     json: str
     description: str
 
     # Required fields for row-cls
     table: Table
+    # Relations loaded by WorkTable.prefetch
+    prefetched: dict = field(default_factory=dict, repr=False)
     changed_columns: set = field(default_factory=lambda: set())  # type: ignore
 
     @property
@@ -176,30 +254,59 @@ class WorkRow(_RowDataClsMixin, PretifyMoneyMixin):
     @property
     def rate(self) -> RateRow:
         """Return relation rate."""
+        if "rate" in self.prefetched:
+            return self.prefetched["rate"]
         return self.table.db.rate.get(id=self.rate_id)  # type: ignore
 
     @property
-    def rework(self) -> RateRow:
-        """Return relation rate."""
+    def rework(self) -> ReworkRow | None:
+        """Return relation rework."""
+        if "rework" in self.prefetched:
+            return self.prefetched["rework"]
         return self.table.db.rework.get(id=self.rework_id)  # type: ignore
 
     @property
     def bonuses(self) -> list[BonusRow]:
         """Return relation bonuses."""
-        work_bonuses = self.table.db.work_bonus.select(
-            work_id=self.id
+        if "bonuses" in self.prefetched:
+            return self.prefetched["bonuses"]
+        return self.table.db.bonus.select(
+            condition=(
+                "id IN (SELECT bonus_id FROM Work_Bonus WHERE work_id = ?)"
+            ),
+            parameters=(self.id,),
         )
-        stmt = ", ".join(
-            str(work_bonus.bonus_id)
+
+    @property
+    def completed_bonuses(self) -> list[TCompleteBonus]:
+        """Return bonuses with 'on_full_sum' flag in saving order."""
+        work_bonuses = self.prefetched.get("work_bonuses")
+        if work_bonuses is None:
+            work_bonuses = self.table.db.work_bonus.select(work_id=self.id)
+        bonuses = {bonus.id: bonus for bonus in self.bonuses}
+        return [
+            {
+                "bonus": bonuses[work_bonus.bonus_id],
+                "on_full_sum": bool(work_bonus.on_full_sum),
+            }
             for work_bonus in work_bonuses
-        )
-        return self.table.db.bonus.select(condition=f"id IN ({stmt})")
+            if work_bonus.bonus_id in bonuses
+        ]
 
     @property
     def other_income(self) -> list[TCompleteOtherIncome]:
-        """Return other income."""
-        json_data = json.loads(self.json)
-        return json_data["other_income"]
+        """Return other income in saving order."""
+        if "other_income" in self.prefetched:
+            return self.prefetched["other_income"]
+        return [
+            {"name": name, "value": value}
+            for name, value in self.table.db.execute(  # type: ignore
+                "SELECT name, value FROM Other_Income "
+                "WHERE work_id = ? ORDER BY position",
+                (self.id,),
+                result=ResultFetch.fetchall,
+            )
+        ]
 
     @property
     def pretty_description(self) -> str:
@@ -211,12 +318,104 @@ class WorkRow(_RowDataClsMixin, PretifyMoneyMixin):
         return description
 
 
-class WorkTable(Table):
+class WorkTable(IdentityTableMixin, Table):
     """Work table."""
 
     row_cls = WorkRow
 
+    select = SelectFixed
+    insert = InsertFixed
     update = UpdateFixed
+    delete = DeleteFixed
+
+    relations = ("rate", "rework", "bonuses", "other_income")
+
+    def prefetch(
+        self,
+        works: Sequence[WorkRow],
+        relations: Sequence[str] = relations,
+    ) -> None:
+        """Load relations for all works with fixed count of queries."""
+        unknown = set(relations) - set(self.relations)
+        if unknown:
+            msg = f"Unknown relations: {', '.join(sorted(unknown))}."
+            raise ValueError(msg)
+
+        if "rate" in relations:
+            rates = self._select_by_ids(
+                self.db.rate,
+                (work.rate_id for work in works),
+            )
+            for work in works:
+                work.prefetched["rate"] = rates.get(work.rate_id)
+
+        if "rework" in relations:
+            reworks = self._select_by_ids(
+                self.db.rework,
+                (work.rework_id for work in works),
+            )
+            for work in works:
+                work.prefetched["rework"] = reworks.get(work.rework_id)
+
+        if "bonuses" in relations:
+            work_bonuses: dict[int, list[WorkBonus]] = {}
+            for stmt, ids in chunked_ids(work.id for work in works):
+                for work_bonus in self.db.work_bonus.select(
+                    condition=f"work_id IN ({stmt})",
+                    parameters=ids,
+                ):
+                    work_bonuses.setdefault(
+                        work_bonus.work_id,
+                        [],
+                    ).append(work_bonus)
+            bonuses = self._select_by_ids(
+                self.db.bonus,
+                (
+                    work_bonus.bonus_id
+                    for items in work_bonuses.values()
+                    for work_bonus in items
+                ),
+            )
+            for work in works:
+                items = work_bonuses.get(work.id, [])
+                bonus_ids = sorted({item.bonus_id for item in items})
+                work.prefetched["work_bonuses"] = items
+                work.prefetched["bonuses"] = [
+                    bonuses[bonus_id]
+                    for bonus_id in bonus_ids
+                    if bonus_id in bonuses
+                ]
+
+        if "other_income" in relations:
+            other_income: dict[int, list[TCompleteOtherIncome]] = {}
+            for stmt, ids in chunked_ids(work.id for work in works):
+                for work_id, name, value in self.db.execute(
+                    "SELECT work_id, name, value FROM Other_Income "
+                    f"WHERE work_id IN ({stmt}) ORDER BY work_id, position",
+                    ids,
+                    result=ResultFetch.fetchall,
+                ):
+                    other_income.setdefault(work_id, []).append({
+                        "name": name,
+                        "value": value,
+                    })
+            for work in works:
+                work.prefetched["other_income"] = other_income.get(
+                    work.id,
+                    [],
+                )
+
+    @staticmethod
+    def _select_by_ids(table: Table, ids: Iterable[int]) -> dict:
+        """Select rows by ids and return it like dict by id."""
+        return {
+            row.id: row
+            for stmt, chunk in chunked_ids(ids)
+            for row in table.select(
+                condition=f"id IN ({stmt})",
+                parameters=chunk,
+            )
+        }
 
 
 @dataclass(slots=True)
@@ -236,4 +435,7 @@ class Work_Bonus(Table):
 
     row_cls = WorkBonus
 
+    select = SelectFixed
+    insert = InsertFixed
     update = UpdateFixed
+    delete = DeleteFixed
@@ -0,0 +1,245 @@
+"""Module contain caches of subcores."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections import namedtuple
+from datetime import datetime
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from typing import Hashable
+from typing import Iterable
+
+
+if TYPE_CHECKING:
+    from workway.typings import TCompleteBonus
+    from workway.typings import TCompleteOtherIncome
+    from workway.typings import TCompleteRework
+
+    from ..db.tables import RateRow
+
+
+__all__ = (
+    "CalculationCache",
+    "MonthCache",
+    "MonthResult",
+)
+
+
+# calculated rate, rework, bonus and other income money
+TComponents = tuple[int, int, int, int]
+
+# Works of month and their money
+MonthResult = namedtuple("MonthResult", "works total")
+
+
+class CalculationCache:
+    """LRU cache of calculated work money components.
+
+    Key contains rate and bonuses with values used by calculation, so
+    changed rate or bonus never hits old entry. Invalidation only drops
+    entries which can not be used anymore.
+    """
+
+    __slots__ = (
+        "maxsize",
+        "hits",
+        "misses",
+        "evictions",
+        "_entries",
+        "_rate_keys",
+        "_bonus_keys",
+    )
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, TComponents] = OrderedDict()
+        self._rate_keys: dict[int, set[Hashable]] = {}
+        self._bonus_keys: dict[int, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        rate: "RateRow",
+        bonuses: Iterable[TCompleteBonus],
+        duration: timedelta,
+        rework: TCompleteRework | None = None,
+        other_income: list[TCompleteOtherIncome] | None = None,
+    ) -> Hashable:
+        """Make key of calculation.
+
+        Money is integer, so bonuses order does not change result and
+        bonuses are sorted.
+        """
+        other_total = 0
+        for income in other_income or ():
+            other_total += income["value"]
+        return (
+            (rate.id, rate.type, rate.value, rate.hours),
+            tuple(sorted(
+                (
+                    bonus["bonus"].id,
+                    bonus["bonus"].type,
+                    bonus["bonus"].value,
+                    bool(bonus["on_full_sum"]),
+                )
+                for bonus in bonuses
+            )),
+            duration,
+            (rework["type"], rework["value"]) if rework else None,
+            other_total,
+        )
+
+    def get(self, key: Hashable) -> TComponents | None:
+        """Return cached components or None."""
+        components = self._entries.get(key)
+        if components is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return components
+
+    def put(self, key: Hashable, components: TComponents) -> None:
+        """Save components of calculation."""
+        if self.maxsize <= 0:
+            return
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._entries[key] = components
+            return
+
+        self._entries[key] = components
+        rate, bonuses, *_ = key  # type: ignore
+        self._rate_keys.setdefault(rate[0], set()).add(key)
+        for bonus in bonuses:
+            self._bonus_keys.setdefault(bonus[0], set()).add(key)
+
+        if len(self._entries) > self.maxsize:
+            old_key, _ = self._entries.popitem(last=False)
+            self._forget(old_key)
+            self.evictions += 1
+
+    def _forget(self, key: Hashable) -> None:
+        """Remove key from rate and bonus indexes."""
+        rate, bonuses, *_ = key  # type: ignore
+        self._discard(self._rate_keys, rate[0], key)
+        for bonus in bonuses:
+            self._discard(self._bonus_keys, bonus[0], key)
+
+    @staticmethod
+    def _discard(
+        index: dict[int, set[Hashable]],
+        id_: int,
+        key: Hashable,
+    ) -> None:
+        keys = index.get(id_)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del index[id_]
+
+    def _invalidate(self, keys: set[Hashable] | None) -> None:
+        for key in tuple(keys or ()):
+            if self._entries.pop(key, None) is not None:
+                self._forget(key)
+
+    def invalidate_rate(self, rate_id: int) -> None:
+        """Drop entries calculated with rate."""
+        self._invalidate(self._rate_keys.get(rate_id))
+
+    def invalidate_bonus(self, bonus_id: int) -> None:
+        """Drop entries calculated with bonus."""
+        self._invalidate(self._bonus_keys.get(bonus_id))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._rate_keys.clear()
+        self._bonus_keys.clear()
+
+    def reset(self) -> None:
+        """Reset counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict."""
+        return {
+            "maxsize": self.maxsize,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class MonthCache:
+    """LRU cache of works and total of months keyed by (year, month).
+
+    Work belongs to months of its start and end, so changed work drops
+    only these months.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_entries")
+
+    def __init__(self, maxsize: int = 24) -> None:
+        """Initialize."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], MonthResult] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def month_key(value: datetime | str) -> tuple[str, str]:
+        """Return year and month of datetime or its ISO text."""
+        value = str(value)
+        return value[:4], value[5:7]
+
+    def get(self, year: str, month: str) -> MonthResult | None:
+        """Return result of month and mark it as recently used."""
+        result = self._entries.get((year, month))
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end((year, month))
+        return result
+
+    def put(self, year: str, month: str, result: MonthResult) -> MonthResult:
+        """Remember result of month, the oldest month is dropped."""
+        self._entries[(year, month)] = result
+        self._entries.move_to_end((year, month))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, *datetimes: datetime | str) -> None:
+        """Drop months of start and end datetimes of works."""
+        for value in datetimes:
+            self._entries.pop(self.month_key(value), None)
+
+    def clear(self) -> None:
+        """Drop all months."""
+        self._entries.clear()
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict."""
+        return {
+            "maxsize": self.maxsize,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,75 @@
+"""Module contain cache of active rates and bonuses."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from ..db import DataBase
+    from ..db.tables import BonusRow
+    from ..db.tables import RateRow
+
+
+__all__ = (
+    "Catalog",
+)
+
+
+class Catalog:
+    """Read-through cache of active rates and bonuses.
+
+    Rates and bonuses change rarely, so they are selected once and kept
+    until Money changes them. Returned lists are copies, rows are shared.
+    """
+
+    __slots__ = ("db", "_rates", "_bonuses", "hits", "misses")
+
+    def __init__(self, db: "DataBase") -> None:
+        """Initialize."""
+        self.db = db
+        self._rates: list[RateRow] | None = None
+        self._bonuses: list[BonusRow] | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def rates(self) -> list["RateRow"]:
+        """Return active rates."""
+        if self._rates is None:
+            self.misses += 1
+            self._rates = self.db.rate.select(state=1)
+        else:
+            self.hits += 1
+        return list(self._rates)
+
+    def bonuses(self) -> list["BonusRow"]:
+        """Return active bonuses."""
+        if self._bonuses is None:
+            self.misses += 1
+            self._bonuses = self.db.bonus.select(state=1)
+        else:
+            self.hits += 1
+        return list(self._bonuses)
+
+    def invalidate_rates(self) -> None:
+        """Drop cached rates."""
+        self._rates = None
+
+    def invalidate_bonuses(self) -> None:
+        """Drop cached bonuses."""
+        self._bonuses = None
+
+    def clear(self, db: "DataBase | None" = None) -> None:
+        """Drop all cached rows, optionally switch to other db."""
+        if db is not None:
+            self.db = db
+        self._rates = None
+        self._bonuses = None
+
+    def as_dict(self) -> dict:
+        """Return statistics like dict."""
+        return {
+            "rates": None if self._rates is None else len(self._rates),
+            "bonuses": None if self._bonuses is None else len(self._bonuses),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
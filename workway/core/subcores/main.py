@@ -1,9 +1,13 @@
 """Module contain main page subcore."""
+from datetime import datetime
 from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import Sequence
 
 from lildb.enumcls import ResultFetch
 
 from .base import BaseCore
+from .cache import MonthResult
 from .work import WorkMaker
 
 
@@ -18,6 +22,12 @@ class Main(BaseCore):
 
     __slots__ = ("db", "core", "work_maker", "months_name")
 
+    # Work starts or ends in the month, served by datetime indexes
+    month_condition = (
+        "(start_datetime >= :start AND start_datetime < :end OR "
+        "end_datetime >= :start AND end_datetime < :end)"
+    )
+
     def __init__(self, core, db: "DataBase") -> None:
         super().__init__(core, db)
         self.work_maker = WorkMaker(core, db)
@@ -37,51 +47,21 @@ class Main(BaseCore):
         }
 
     def _get_work_years(self) -> set[str]:
-        """Get works year from start and end datetime."""
-        stmt = "SELECT {} FROM Work".format(
-            "DISTINCT substr(start_datetime, 1, 4)",
-        )
-        start_dttms = self.db.execute(
-            stmt,
+        """Get works year from calendar table."""
+        years = self.db.execute(
+            "SELECT DISTINCT year FROM Work_Month",
             result=ResultFetch.fetchall
         )
-        stmt = "SELECT {} FROM Work".format(
-            "DISTINCT substr(end_datetime, 1, 4)",
-        )
-        end_dttms = self.db.execute(
-            stmt,
-            result=ResultFetch.fetchall
-        )
-
-        return {
-            i[0]
-            for i in {*start_dttms, *end_dttms}  # type: ignore
-        }
+        return {i[0] for i in years}  # type: ignore
 
     def _get_work_month_by_year(self, year: str) -> set[str]:
-        """Get works month from start and end datetime by year."""
-        stmt = "SELECT {} FROM Work WHERE {}".format(
-            "DISTINCT substr(start_datetime, 6, 2)",
-            f"substr(start_datetime, 1, 4) = '{year}'"
-        )
-        starts_dttms = self.db.execute(
-            stmt,
-            result=ResultFetch.fetchall
-        )
-
-        stmt = "SELECT {} FROM Work WHERE {}".format(
-            "DISTINCT substr(end_datetime, 6, 2)",
-            f"substr(end_datetime, 1, 4) = '{year}'"
-        )
-        end_dttms = self.db.execute(
-            stmt,
+        """Get works month from calendar table by year."""
+        months = self.db.execute(
+            "SELECT month FROM Work_Month WHERE year = ?",
+            (year,),
             result=ResultFetch.fetchall
         )
-
-        return {
-            i[0]
-            for i in {*starts_dttms, *end_dttms}  # type: ignore
-        }
+        return {i[0] for i in months}  # type: ignore
 
     def filters_data(self, year: str) -> tuple[map, dict[str, str]]:
         """Get filters data month and years."""
@@ -94,24 +74,154 @@ class Main(BaseCore):
         }
         return map(lambda x: str(x), sorted(years)), months_dict
 
-    def get_works(self, month: str, year: str) -> list["WorkRow"]:
-        """Get works by year and month."""
-        stmt = "{} == '{}' AND {} == '{}' OR {} == '{}' AND {} == '{}' {}"
-        return self.db.work.select(
-            condition=stmt.format(
-                "substr(start_datetime, 1, 4)",
-                year,
-                "substr(start_datetime, 6, 2)",
-                month,
-                "substr(end_datetime, 1, 4)",
-                year,
-                "substr(end_datetime, 6, 2)",
-                month,
-                "ORDER BY end_datetime asc"
-            )
+    def _month_bounds(self, month: str, year: str) -> tuple[str, str]:
+        """Return half-open ISO prefix range [start, end) of the month.
+
+        Datetimes are stored as ISO text, so it is sorted
+        lexicographically and the range can be served by an index.
+        """
+        year_num, month_num = int(year), int(month)
+        if month_num == 12:
+            next_year, next_month = year_num + 1, 1
+        else:
+            next_year, next_month = year_num, month_num + 1
+        return (
+            f"{year_num:04d}-{month_num:02d}",
+            f"{next_year:04d}-{next_month:02d}",
         )
 
-    def fetch_value_by_works(self, work: "WorkRow") -> float:
+    def month_result(self, month: str | None, year: str) -> MonthResult:
+        """Return works and total of month, result is cached.
+
+        Returned works list is shared by cache and must not be changed.
+        """
+        if not month or not year:
+            return MonthResult([], 0)
+        result = self.core.month_cache.get(year, month)
+        if result is not None:
+            return result
+
+        start, end = self._month_bounds(month, year)
+        works = self.db.work.select(
+            condition=f"{self.month_condition} ORDER BY end_datetime asc",
+            parameters={"start": start, "end": end},
+        )
+        total = self.db.execute(
+            "SELECT COALESCE(SUM(value), 0) FROM Work "
+            f"WHERE {self.month_condition}",
+            {"start": start, "end": end},
+            result=ResultFetch.fetchone,
+        )
+        return self.core.month_cache.put(
+            year,
+            month,
+            MonthResult(works, total[0]),  # type: ignore
+        )
+
+    def get_works(self, month: str | None, year: str) -> list["WorkRow"]:
+        """Get works which start or end in the month."""
+        return list(self.month_result(month, year).works)
+
+    def month_total(self, month: str | None, year: str) -> int:
+        """Return money of works which start or end in the month."""
+        return self.month_result(month, year).total
+
+    def daily_totals(
+        self,
+        month: str | None,
+        year: str,
+    ) -> dict[str, int]:
+        """Return money of works by start day for works started in month.
+
+        Keys are ISO dates 'YYYY-MM-DD'.
+        """
+        if not month or not year:
+            return {}
+        start, end = self._month_bounds(month, year)
+        totals = self.db.execute(
+            "SELECT substr(start_datetime, 1, 10), SUM(value) "
+            "FROM Work WHERE start_datetime >= :start AND "
+            "start_datetime < :end GROUP BY 1 ORDER BY 1",
+            {"start": start, "end": end},
+            result=ResultFetch.fetchall,
+        )
+        return dict(totals)  # type: ignore
+
+    def other_income_totals(
+        self,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+    ) -> dict[str, int]:
+        """Return other income by name for works started in [start, end).
+
+        The biggest income is the first.
+        """
+        totals = self.db.execute(
+            "SELECT Other_Income.name, SUM(Other_Income.value) "
+            "FROM Work JOIN Other_Income ON Other_Income.work_id = Work.id "
+            "WHERE Work.start_datetime >= :start "
+            "AND Work.start_datetime < :end "
+            "GROUP BY 1 ORDER BY 2 DESC",
+            {
+                "start": "" if start is None else str(start),
+                "end": "9999" if end is None else str(end),
+            },
+            result=ResultFetch.fetchall,
+        )
+        return dict(totals)  # type: ignore
+
+    def get_works_with_relations(
+        self,
+        month: str | None,
+        year: str,
+    ) -> list["WorkRow"]:
+        """Get works by year and month with loaded rate, rework, bonuses."""
+        works = self.get_works(month, year)
+        if works:
+            self.db.work.prefetch(works)
+        return works
+
+    def iter_works(
+        self,
+        start: datetime | str | None = None,
+        end: datetime | str | None = None,
+        *,
+        page_size: int = 500,
+        prefetch: Sequence[str] = (),
+    ) -> Iterator["WorkRow"]:
+        """Iterate works which end in [start, end) ordered by end datetime.
+
+        Works are read by pages with keyset pagination on
+        (end_datetime, id), so memory does not depend on range size.
+        """
+        parameters = {
+            "start": "" if start is None else str(start),
+            "end": "9999" if end is None else str(end),
+            "last_end": "",
+            "last_id": 0,
+            "size": page_size,
+        }
+        while True:
+            works = self.db.work.select(
+                size=page_size,
+                condition=(
+                    "end_datetime >= :start AND end_datetime < :end AND "
+                    "(end_datetime, id) > (:last_end, :last_id) "
+                    "ORDER BY end_datetime, id LIMIT :size"
+                ),
+                parameters=parameters,
+                prefetch=prefetch,
+            )
+            yield from works
+            if len(works) < page_size:
+                return
+            # next page starts from the last work, index range is narrowed
+            parameters["start"] = parameters["last_end"] = (
+                works[-1].end_datetime
+            )
+            parameters["last_id"] = works[-1].id
+
+    def fetch_value_by_works(self, work: "WorkRow") -> int:
         """Fetch money value by work."""
         value = 0
         rate = work.rate
@@ -126,5 +236,15 @@ class Main(BaseCore):
 
     def delete_work(self, work: "WorkRow") -> None:
         """Delete work from db."""
-        self.db.work_bonus.delete(work_id=work.id)
-        work.delete()
+        with self.db.batch():
+            self.db.work_bonus.delete(work_id=work.id)
+            for table in ("Work_Breakdown", "Other_Income"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE work_id = ?",
+                    (work.id,),
+                )
+            work.delete()
+        self.core.month_cache.invalidate(
+            work.start_datetime,
+            work.end_datetime,
+        )
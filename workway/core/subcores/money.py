@@ -1,7 +1,11 @@
 """Module contain rate and bonus page subcore."""
 from typing import TYPE_CHECKING
+from typing import Iterable
+
+from workway.money import to_cents
 
 from .base import BaseCore
+from .recalculation import Recalculation
 
 
 if TYPE_CHECKING:
@@ -17,50 +21,117 @@ class Money(BaseCore):
     def prepare_insert_data(self, data: dict) -> None:
         if data["type"] == "hours":
             data.pop("hours")
+        self.prepare_value(data)
+
+    def prepare_value(self, data: dict) -> None:
+        """Set name by value if it is empty, convert value to cents."""
         data["name"] = data["name"] or data["value"]
+        data["value"] = to_cents(data["value"])
 
     def add_rate(self, data: dict) -> "RateRow":
         """Add new rate."""
         self.prepare_insert_data(data)
         self.db.rate.insert(data)
+        self.core.catalog.invalidate_rates()
         return self.db.rate.get(**data)  # type: ignore
 
     def add_bonus(self, data: dict) -> "BonusRow":
         """Add new bonus."""
-        data["name"] = data["name"] or data["value"]
+        self.prepare_value(data)
         self.db.bonus.insert(data)
+        self.core.catalog.invalidate_bonuses()
         return self.db.bonus.get(**data)  # type: ignore
 
     def all_rate(self) -> list["RateRow"]:
         """Getting rate."""
-        return self.db.rate.select(state=1)
+        return self.core.catalog.rates()
 
     def all_bonus(self) -> list["BonusRow"]:
         """Getting rate."""
-        return self.db.bonus.select(state=1)
+        return self.core.catalog.bonuses()
 
     def update_item(self, data: dict, item) -> "RateRow":
-        """Update rate or bonus."""
+        """Update rate, saved money of its works is recalculated."""
         if data.get("type"):
             self.prepare_insert_data(data)
 
+        # saved money components contain name of rate
+        renamed = data.get("name", item.name) != item.name
         for key, value in data.items():
             setattr(item, key, value)
 
         item.change()
+        self.core.calculation_cache.invalidate_rate(item.id)
+        self.core.catalog.clear()
+        self.recalculate_works(rate_ids=(item.id,), rewrite=renamed)
         return item
 
+    def replace_rate(self, data: dict, item: "RateRow") -> "RateRow":
+        """Mark rate as deleted and add new rate instead of it."""
+        with self.db.batch():
+            item.state = 2
+            item.change()
+            self.core.calculation_cache.invalidate_rate(item.id)
+            self.core.catalog.invalidate_rates()
+            return self.add_rate(data)
+
+    def replace_bonus(self, data: dict, item: "BonusRow") -> "BonusRow":
+        """Mark bonus as deleted and add new bonus instead of it."""
+        with self.db.batch():
+            item.state = 2
+            item.change()
+            self.core.calculation_cache.invalidate_bonus(item.id)
+            self.core.catalog.invalidate_bonuses()
+            return self.add_bonus(data)
+
     def update_bonus(self, data: dict, item: "BonusRow") -> "BonusRow":
-        """Update bonus item."""
+        """Update bonus, saved money of its works is recalculated."""
+        self.prepare_value(data)
+        renamed = data["name"] != item.name
         for key, value in data.items():
             setattr(item, key, value)
         item.change()
+        self.core.calculation_cache.invalidate_bonus(item.id)
+        self.core.catalog.invalidate_bonuses()
+        self.recalculate_works(bonus_ids=(item.id,), rewrite=renamed)
         return item
 
     def delete_rate(self, id: int) -> None:
         """Delete curent rate, change state to 2 it is deleted status."""
         self.db.rate.update({"state": 2}, id=id)
+        self.core.calculation_cache.invalidate_rate(id)
+        self.core.catalog.invalidate_rates()
 
     def delete_bonus(self, id: int) -> None:
         """Delete curent bonus, change state to 2 it is deleted status."""
         self.db.bonus.update({"state": 2}, id=id)
+        self.core.calculation_cache.invalidate_bonus(id)
+        self.core.catalog.invalidate_bonuses()
+
+    def recalculate_works(
+        self,
+        rate_ids: Iterable[int] = (),
+        bonus_ids: Iterable[int] = (),
+        *,
+        workers: int | None = None,
+        rewrite: bool = False,
+    ) -> int:
+        """Recalculate money of works which use rates or bonuses.
+
+        It is called when rate or bonus is edited in place, replaced
+        rate or bonus keeps money of old works. Count of processes is
+        taken from settings if it is not passed. Renamed rate or bonus
+        needs rewrite of money components of all its works.
+        """
+        if workers is None:
+            workers = self.core.settings.recalc_workers
+        return Recalculation(self.core, self.db).recalculate(
+            rate_ids,
+            bonus_ids,
+            workers=workers,
+            rewrite=rewrite,
+        )
+
+    def calculation_stats(self) -> dict:
+        """Return hit and miss statistics of calculation cache."""
+        return self.core.calculation_cache.as_dict()
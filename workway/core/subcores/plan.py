@@ -0,0 +1,135 @@
+"""Module contain compiled pay plans for many works."""
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING
+from typing import Hashable
+from typing import Iterable
+from typing import Sequence
+
+from workway.money import percent_of
+
+
+if TYPE_CHECKING:
+    from workway.typings import TCompleteBonus
+    from workway.typings import TCompleteRework
+
+    from ..db.tables import RateRow
+
+
+__all__ = (
+    "PayPlan",
+)
+
+
+SECONDS_IN_HOUR = 60 * 60
+SECONDS_IN_DAY = 24 * SECONDS_IN_HOUR
+
+
+class PayPlan:
+    """Flat coefficients of rate and bonuses for calculation of works.
+
+    Plan gives the same result as Сalculation.result(), but rate type
+    and bonuses are resolved once for all works with the same rate and
+    bonuses.
+    """
+
+    __slots__ = (
+        "rate_value",
+        "rate_hours",
+        "by_shift",
+        "by_hours",
+        "fix_bonus",
+        "rate_percents",
+        "full_percents",
+    )
+
+    def __init__(
+        self,
+        rate: "RateRow",
+        bonuses: Iterable[TCompleteBonus] = (),
+    ) -> None:
+        """Initialize."""
+        self.rate_value = rate.value
+        self.rate_hours = rate.hours
+        self.by_shift = rate.type == "shift"
+        self.by_hours = rate.type == "hours"
+
+        fix_bonus = 0
+        rate_percents = []
+        full_percents = []
+        for bonus in bonuses:
+            match bonus["bonus"].type:
+                case "fix":
+                    fix_bonus += bonus["bonus"].value
+                case "percent" if bonus["on_full_sum"]:
+                    full_percents.append(bonus["bonus"].value)
+                case "percent":
+                    rate_percents.append(bonus["bonus"].value)
+        self.fix_bonus = fix_bonus
+        self.rate_percents = tuple(rate_percents)
+        self.full_percents = tuple(full_percents)
+
+    @staticmethod
+    def make_key(
+        rate: "RateRow",
+        bonuses: Iterable[TCompleteBonus] = (),
+    ) -> Hashable:
+        """Make key of plan by values used in it."""
+        return (
+            (rate.type, rate.value, rate.hours),
+            tuple(sorted(
+                (
+                    bonus["bonus"].type,
+                    bonus["bonus"].value,
+                    bool(bonus["on_full_sum"]),
+                )
+                for bonus in bonuses
+            )),
+        )
+
+    def apply(
+        self,
+        durations: Sequence[int],
+        reworks: Sequence[TCompleteRework | None] | None = None,
+        other_income: Sequence[int] | None = None,
+    ) -> array:
+        """Return money of works by their durations in whole seconds.
+
+        Reworks and other income totals are in the order of durations.
+        """
+        reworks = reworks or (None,) * len(durations)
+        other_income = other_income or (0,) * len(durations)
+        rate_value = self.rate_value
+        rate_hours = self.rate_hours
+        rate_percents = self.rate_percents
+        full_percents = self.full_percents
+        shift_money = rate_value if self.by_shift else 0
+
+        values = array("q")
+        for duration, rework, other in zip(durations, reworks, other_income):
+            rate_money = shift_money
+            if self.by_hours:
+                # the same hours as 'timedelta.seconds' of shift
+                hours = duration % SECONDS_IN_DAY // SECONDS_IN_HOUR
+                rate_money = hours * rate_value
+
+            rework_money = 0
+            if rework is not None:
+                match rework["type"]:
+                    case "percent":
+                        rework_hours = duration // SECONDS_IN_HOUR
+                        rework_money = percent_of(
+                            (rework_hours - rate_hours) * rate_value,
+                            rework["value"],
+                        )
+                    case "fix":
+                        rework_money = rework["value"]
+
+            money = rate_money + rework_money + self.fix_bonus + other
+            for percent in rate_percents:
+                money += percent_of(rate_money, percent)
+            for percent in full_percents:
+                money += percent_of(rate_money + rework_money, percent)
+            values.append(money)
+        return values
@@ -0,0 +1,405 @@
+"""Module contain bulk recalculation of works money."""
+from __future__ import annotations
+
+import sys
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from multiprocessing import get_context
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+from lildb.enumcls import ResultFetch
+
+from ..db import DataBase
+from .base import BaseCore
+from .plan import PayPlan
+from .work import Сalculation
+
+
+if TYPE_CHECKING:
+    from workway.typings import TCompleteBonus
+    from workway.typings import TCompleteOtherIncome
+
+    from ..db.tables import WorkRow
+
+
+# Work id, new value and breakdown rows of changed works
+TDeltas = tuple[array, array, list[tuple]]
+
+# Rate and bonus rows of worker process
+WorkerRate = namedtuple("WorkerRate", "id name type value hours")
+WorkerBonus = namedtuple("WorkerBonus", "id name type value")
+
+
+def can_spawn_workers() -> bool:
+    """Return True if worker processes can be started.
+
+    Spawn runs sys.executable, in packaged app it is app binary and
+    not python interpreter.
+    """
+    if getattr(sys, "frozen", False) or not sys.executable:
+        return False
+    return Path(sys.executable).name.lower().startswith(("python", "pypy"))
+
+
+def affected_condition(
+    rate_ids: Sequence[int] = (),
+    bonus_ids: Sequence[int] = (),
+) -> tuple[str, list[int]]:
+    """Return condition of works which use rates or bonuses."""
+    conditions = []
+    if rate_ids:
+        conditions.append(
+            "Work.rate_id IN ({})".format(", ".join("?" * len(rate_ids)))
+        )
+    if bonus_ids:
+        conditions.append(
+            "Work.id IN (SELECT work_id FROM Work_Bonus "
+            "WHERE bonus_id IN ({}))".format(
+                ", ".join("?" * len(bonus_ids)),
+            )
+        )
+    return " OR ".join(conditions), [*rate_ids, *bonus_ids]
+
+
+def calculate_values(items: Sequence[tuple]) -> array:
+    """Calculate money by plans of rate and bonuses.
+
+    Item is rate, bonuses, duration in seconds, rework and other income.
+    """
+    plans: dict[Hashable, PayPlan] = {}
+    groups: dict[Hashable, list[int]] = {}
+    for index, (rate, bonuses, *_) in enumerate(items):
+        key = PayPlan.make_key(rate, bonuses)
+        if key not in plans:
+            plans[key] = PayPlan(rate, bonuses)
+        groups.setdefault(key, []).append(index)
+
+    values = array("q", [0]) * len(items)
+    for key, indexes in groups.items():
+        group = [items[index] for index in indexes]
+        group_values = plans[key].apply(
+            [item[2] for item in group],
+            [item[3] for item in group],
+            [item[4] for item in group],
+        )
+        for index, value in zip(indexes, group_values):
+            values[index] = value
+    return values
+
+
+def recalculate_range(
+    path: str,
+    condition: str,
+    parameters: Sequence[int],
+    first_id: int,
+    last_id: int,
+    rewrite: bool = False,
+) -> TDeltas:
+    """Recalculate works in id range with own read only connection.
+
+    Run in worker process, changes are returned to single writer.
+    With rewrite not changed works are returned too.
+    """
+    connect = DataBase.connect_read_only(path)
+    try:
+        rates = {
+            row[0]: WorkerRate(*row)
+            for row in connect.execute(
+                "SELECT id, name, type, value, hours FROM Rate"
+            )
+        }
+        bonuses = {
+            row[0]: WorkerBonus(*row)
+            for row in connect.execute(
+                "SELECT id, name, type, value FROM Bonus"
+            )
+        }
+        work_bonuses: dict[int, list[TCompleteBonus]] = {}
+        for work_id, bonus_id, on_full_sum in connect.execute(
+            "SELECT work_id, bonus_id, on_full_sum FROM Work_Bonus "
+            "WHERE work_id BETWEEN ? AND ? ORDER BY work_id, rowid",
+            (first_id, last_id),
+        ):
+            if bonus_id in bonuses:
+                work_bonuses.setdefault(work_id, []).append({
+                    "bonus": bonuses[bonus_id],  # type: ignore
+                    "on_full_sum": bool(on_full_sum),
+                })
+        other_income: dict[int, list[TCompleteOtherIncome]] = {}
+        for work_id, name, value in connect.execute(
+            "SELECT work_id, name, value FROM Other_Income "
+            "WHERE work_id BETWEEN ? AND ? ORDER BY work_id, position",
+            (first_id, last_id),
+        ):
+            other_income.setdefault(work_id, []).append({
+                "name": name,
+                "value": value,
+            })
+        works = connect.execute(
+            "SELECT Work.id, start_datetime, end_datetime, rate_id, "
+            "Work.value, Rework.type, Rework.value "
+            "FROM Work LEFT JOIN Rework ON Rework.id = Work.rework_id "
+            f"WHERE ({condition}) AND Work.id BETWEEN ? AND ? "
+            "ORDER BY Work.id",
+            (*parameters, first_id, last_id),
+        ).fetchall()
+    finally:
+        connect.close()
+
+    items = []
+    for id_, start, end, rate_id, _, rework_type, rework_value in works:
+        start_dttm = datetime.fromisoformat(start)
+        end_dttm = datetime.fromisoformat(end)
+        rework = None
+        if rework_type is not None:
+            rework = {"type": rework_type, "value": rework_value}
+        other = other_income.get(id_, [])
+        items.append((
+            rates[rate_id],
+            work_bonuses.get(id_, []),
+            int((end_dttm - start_dttm).total_seconds()),
+            rework,
+            sum(income["value"] for income in other),
+            start_dttm,
+            end_dttm,
+            other,
+        ))
+
+    ids = array("q")
+    values = array("q")
+    breakdown: list[tuple] = []
+    for work, item, value in zip(works, items, calculate_values(items)):
+        if value == work[4] and not rewrite:
+            continue
+        ids.append(work[0])
+        values.append(value)
+        rate, work_bonus, _, rework, _, start_dttm, end_dttm, other = item
+        calculation = Сalculation(
+            None,  # type: ignore
+            rate,
+            work_bonus,
+            start_dttm,
+            end_dttm,
+            rework,
+            other,
+        )
+        breakdown.extend(
+            (work[0], position, row["name"], row["type"], row["money"])
+            for position, row in enumerate(calculation.breakdown())
+        )
+    return ids, values, breakdown
+
+
+class Recalculation(BaseCore):
+    """Recalculate saved money of works after rate or bonus changes."""
+
+    __slots__ = ("db", "core")
+
+    def iter_affected_works(
+        self,
+        rate_ids: Iterable[int] = (),
+        bonus_ids: Iterable[int] = (),
+        *,
+        page_size: int = 500,
+    ) -> Iterator[list["WorkRow"]]:
+        """Iterate pages of works which use rates or bonuses.
+
+        Every page has loaded rate, rework and bonuses.
+        """
+        condition, parameters = affected_condition(
+            list(rate_ids),
+            list(bonus_ids),
+        )
+        if not condition:
+            return
+
+        condition = f"({condition}) AND id > ? ORDER BY id LIMIT ?"
+        last_id = 0
+        while True:
+            works = self.db.work.select(
+                size=page_size,
+                condition=condition,
+                parameters=(*parameters, last_id, page_size),
+                prefetch=self.db.work.relations,
+            )
+            if works:
+                yield works
+            if len(works) < page_size:
+                return
+            last_id = works[-1].id
+
+    def calculate(self, works: list["WorkRow"]) -> array:
+        """Calculate money of works by plans of their rate and bonuses."""
+        return calculate_values([
+            (
+                work.rate,
+                work.completed_bonuses,
+                int((work.end_dttm - work.start_dttm).total_seconds()),
+                Сalculation.get_completed_rework(work),
+                sum(income["value"] for income in work.other_income or ()),
+            )
+            for work in works
+        ])
+
+    def _calculate_deltas(
+        self,
+        rate_ids: Iterable[int],
+        bonus_ids: Iterable[int],
+        page_size: int,
+        rewrite: bool = False,
+    ) -> TDeltas:
+        """Calculate changes of works in this process."""
+        ids = array("q")
+        values = array("q")
+        breakdown: list[tuple] = []
+        for works in self.iter_affected_works(
+            rate_ids,
+            bonus_ids,
+            page_size=page_size,
+        ):
+            for work, value in zip(works, self.calculate(works)):
+                if value == work.value and not rewrite:
+                    continue
+                ids.append(work.id)
+                values.append(value)
+                calculation = Сalculation.from_work(self, work)
+                breakdown.extend(
+                    (work.id, position, row["name"], row["type"], row["money"])
+                    for position, row in enumerate(calculation.breakdown())
+                )
+        return ids, values, breakdown
+
+    def shard_ranges(
+        self,
+        condition: str,
+        parameters: Sequence[int],
+        shards: int,
+    ) -> list[tuple[int, int]]:
+        """Split ids of works by condition to ranges with equal size."""
+        ids = [
+            row[0]
+            for row in self.db.execute(  # type: ignore
+                f"SELECT id FROM Work WHERE {condition} ORDER BY id",
+                parameters,
+                result=ResultFetch.fetchall,
+            )
+        ]
+        if not ids:
+            return []
+        size = -(-len(ids) // shards)
+        return [
+            (ids[index], ids[min(index + size, len(ids)) - 1])
+            for index in range(0, len(ids), size)
+        ]
+
+    def _calculate_deltas_parallel(
+        self,
+        rate_ids: Iterable[int],
+        bonus_ids: Iterable[int],
+        workers: int,
+        rewrite: bool = False,
+    ) -> TDeltas:
+        """Calculate changes of works in worker processes.
+
+        There are more ranges than workers, so a slow range does not
+        keep other workers idle.
+        """
+        ids = array("q")
+        values = array("q")
+        breakdown: list[tuple] = []
+        condition, parameters = affected_condition(
+            list(rate_ids),
+            list(bonus_ids),
+        )
+        if not condition:
+            return ids, values, breakdown
+
+        ranges = self.shard_ranges(condition, parameters, workers * 4)
+        if not ranges:
+            return ids, values, breakdown
+        # spawn, because fork of process with gui threads is not safe
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+        ) as executor:
+            for range_ids, range_values, range_breakdown in executor.map(
+                recalculate_range,
+                repeat(str(self.db.path)),
+                repeat(condition),
+                repeat(parameters),
+                *zip(*ranges),
+                repeat(rewrite),
+            ):
+                ids.extend(range_ids)
+                values.extend(range_values)
+                breakdown.extend(range_breakdown)
+        return ids, values, breakdown
+
+    def recalculate(
+        self,
+        rate_ids: Iterable[int] = (),
+        bonus_ids: Iterable[int] = (),
+        *,
+        page_size: int = 500,
+        workers: int = 1,
+        rewrite: bool = False,
+    ) -> int:
+        """Recalculate works which use rates or bonuses.
+
+        With more than one worker works are calculated in processes,
+        if processes can be started. Changed values and their money
+        components are written with executemany in one transaction.
+        With rewrite money components of all works are saved again,
+        they contain names of rates and bonuses. Return count of saved
+        works.
+        """
+        if (
+            workers > 1 and
+            self.db.path != ":memory:" and
+            can_spawn_workers()
+        ):
+            ids, values, breakdown = self._calculate_deltas_parallel(
+                rate_ids,
+                bonus_ids,
+                workers,
+                rewrite,
+            )
+        else:
+            ids, values, breakdown = self._calculate_deltas(
+                rate_ids,
+                bonus_ids,
+                page_size,
+                rewrite,
+            )
+
+        if not ids:
+            return 0
+        with self.db.batch():
+            self.db.execute(
+                "UPDATE Work SET value = ? WHERE id = ?",
+                zip(values, ids),
+                many=True,
+            )
+            self.db.execute(
+                "DELETE FROM Work_Breakdown WHERE work_id = ?",
+                ((id_,) for id_ in ids),
+                many=True,
+            )
+            self.db.execute(
+                "INSERT INTO Work_Breakdown "
+                "(work_id, position, name, type, money) "
+                "VALUES (?, ?, ?, ?, ?)",
+                breakdown,
+                many=True,
+            )
+        self.db.identity.invalidate(self.db.work.name)
+        self.core.month_cache.clear()
+        return len(ids)
@@ -1,9 +1,12 @@
 """Module contain settings page subcore."""
-
+import json
+import os
+from datetime import datetime
 from typing import TYPE_CHECKING
 from typing import Literal
 
 from .base import BaseCore
+from .recalculation import can_spawn_workers
 
 
 if TYPE_CHECKING:
@@ -21,10 +24,7 @@ class Settings(BaseCore):
     @property
     def current_theme(self) -> None | Ttheme:
         """Return current theme."""
-        theme = self.db.setting.get(key="theme")
-        if theme is None:
-            return "dark"
-        match theme.value:
+        match self.db.store.get("theme", "dark"):
             case "dark":
                 return "dark"
             case "light":
@@ -43,17 +43,104 @@ class Settings(BaseCore):
         path.mkdir(exist_ok=True)
         return path
 
+    def _set_value(self, key: str, value: str) -> None:
+        """Set setting value in db."""
+        self.db.store.set(key, value)
+
     def set_theme(self, theme_name: Ttheme):
         """Set theme in db."""
-        theme = self.db.setting.get(key="theme")
-        if theme is None:
-            self.db.setting.add({
-                "key": "theme",
-                "value": theme_name,
-            })
-            theme = self.db.setting.get(key="theme")
-        theme.value = theme_name
-        theme.change()
+        self._set_value("theme", theme_name)
+
+    @property
+    def db_profile(self) -> str:
+        """Return current db performance profile."""
+        return self.db.stored_profile()
+
+    def set_db_profile(self, profile_name: str) -> None:
+        """Apply db performance profile and save it."""
+        self.db.apply_profile(profile_name)
+        self._set_value("db_profile", profile_name)
+
+    @property
+    def max_recalc_workers(self) -> int:
+        """Return max count of recalculation processes.
+
+        Packaged app can not start worker processes, it has only one.
+        """
+        if not can_spawn_workers():
+            return 1
+        return os.cpu_count() or 1
+
+    @property
+    def recalc_workers(self) -> int:
+        """Return count of processes for recalculation of works."""
+        workers = self.db.store.get_int("recalc_workers", 1)
+        return max(1, min(workers, self.max_recalc_workers))
+
+    def set_recalc_workers(self, workers: int) -> None:
+        """Save count of processes for recalculation of works."""
+        if not 1 <= workers <= self.max_recalc_workers:
+            msg = f"Workers must be from 1 to {self.max_recalc_workers}."
+            raise ValueError(msg)
+        self._set_value("recalc_workers", str(workers))
+
+    @property
+    def slow_query_ms(self) -> float:
+        """Return threshold of slow query in milliseconds."""
+        return self.db.queries.slow_ms
+
+    def set_slow_query_ms(self, slow_ms: float) -> None:
+        """Save threshold of slow query, zero disables slow query log."""
+        if slow_ms < 0:
+            msg = "Threshold of slow query must not be negative."
+            raise ValueError(msg)
+        self.db.queries.slow_ms = slow_ms
+        self._set_value("slow_query_ms", str(slow_ms))
+
+    @property
+    def trace_queries(self) -> bool:
+        """Return True if callers of queries are searched."""
+        return self.db.queries.trace
+
+    def set_trace_queries(self, trace: bool) -> None:
+        """Save tracing of queries, it slows down every query."""
+        self.db.queries.trace = trace
+        self._set_value("trace_queries", str(int(trace)))
+
+    def query_stats(self) -> dict:
+        """Return statistics of executed queries."""
+        return {
+            "queries": self.db.queries.as_dict(),
+            "statements": self.db.statements.as_dict(),
+            "identity": self.db.identity.as_dict(),
+        }
+
+    def reset_query_stats(self) -> None:
+        """Reset statistics of executed queries."""
+        self.db.queries.reset()
+        self.db.statements.reset()
+        self.db.identity.reset()
+
+    def dump_query_stats(self, path: "Path | None" = None) -> "Path":
+        """Write statistics of queries to json file and return its path.
+
+        By default file is created near db file.
+        """
+        if path is None:
+            path = self.db.normalize_path(self.db_path).with_name(
+                "work_way_queries_{}.json".format(
+                    datetime.now().strftime("%Y%m%d_%H%M%S"),
+                ),
+            )
+        path.write_text(
+            json.dumps(self.query_stats(), ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        return path
+
+    def checkpoint_db(self) -> None:
+        """Write all db changes to db file."""
+        self.db.checkpoint()
 
     def reinitialize_db(self) -> None:
         """Reinitialize db obj."""
@@ -1,14 +1,17 @@
 """Module contain create work view subcore."""
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Iterable
 
+from lildb.enumcls import ResultFetch
 from typing_extensions import Self
 
+from workway.money import format_cents
+from workway.money import percent_of
+
 from .base import BaseCore
 
 
@@ -40,31 +43,13 @@ class Сalculation:
         "calculated_other",
     )
 
-    @classmethod
-    def get_bonus_on_full_sum_ids(
-        cls: type[Сalculation],
-        work: "WorkRow",
-    ) -> list["BonusRow"]:
-        db = work.table.db
-        work_bonuses = db.work_bonus.select(
-            work_id=work.id,
-            on_full_sum=1,
-        )
-        stmt = ", ".join(
-            str(work_bonus.bonus_id)
-            for work_bonus in work_bonuses
-        )
-        return db.bonus.select(condition=f"id IN ({stmt})")
-
     @classmethod
     def get_completed_rework(
         cls: type[Сalculation],
         work: "WorkRow",
     ) -> TCompleteRework | None:
-        db = work.table.db
-        rework: Any = None
-        if work.rework_id is not None:
-            rework = db.rework.get(id=work.rework_id)
+        rework: Any = work.rework if work.rework_id is not None else None
+        if rework is not None:
             rework = {
                 "value": rework.value,
                 "type": rework.type,
@@ -74,26 +59,14 @@ class Сalculation:
     @classmethod
     def from_work(cls, core, work: "WorkRow") -> Self:
         """Create calculation obj from work."""
-        bonus_full_sum_ids = cls.get_bonus_on_full_sum_ids(work)
-        completed_bonuses: list[TCompleteBonus] = [
-            {
-                "bonus": bonus,
-                "on_full_sum": True,
-            } if bonus.id in bonus_full_sum_ids
-            else {
-                "bonus": bonus,
-                "on_full_sum": False,
-            }
-            for bonus in work.bonuses
-        ]
-
-        return cls(
+        return cls.cached(
             core,
             work.rate,
-            completed_bonuses,
+            work.completed_bonuses,
             work.start_dttm,
             work.end_dttm,
             cls.get_completed_rework(work),
+            work.other_income,
         )
 
     class RateСalculation:
@@ -119,7 +92,7 @@ class Сalculation:
             self.calc = obj
             return self
 
-        def __call__(self) -> float:
+        def __call__(self) -> int:
             money = 0
             rate = self.calc.rate
             start_datetime = self.calc.start_datetime
@@ -147,7 +120,7 @@ class Сalculation:
         def _calculate_fix_sum(
             self,
             bonuses: Iterable["BonusRow"] | map,
-        ) -> float:
+        ) -> int:
             """Calculate bonus with type 'fix'."""
             money = 0
             for bonus in bonuses:
@@ -157,7 +130,7 @@ class Сalculation:
         def _calculate_percent(
             self,
             bonuses: Iterable[TCompleteBonus],
-        ) -> float:
+        ) -> int:
             """Calculate bonus with type 'percent'."""
             calculate_rate = self.calc.calculated_rate
             calculate_rework = self.calc.calculated_rework
@@ -169,11 +142,11 @@ class Сalculation:
             for bonus in bonuses:
                 if bonus["on_full_sum"]:
                     bonuses_list.append(
-                        rate_with_rework / 100 * bonus["bonus"].value
+                        percent_of(rate_with_rework, bonus["bonus"].value)
                     )
                     continue
                 bonuses_list.append(
-                    calculate_rate / 100 * bonus["bonus"].value
+                    percent_of(calculate_rate, bonus["bonus"].value)
                 )
             return sum(bonuses_list)
 
@@ -195,9 +168,9 @@ class Сalculation:
             data_table_bonuses = []
             for bonus in percent_bonuses:
                 if bonus["on_full_sum"]:
-                    money = round(
-                        rate_with_rework / 100 * bonus["bonus"].value,
-                        2,
+                    money = percent_of(
+                        rate_with_rework,
+                        bonus["bonus"].value,
                     )
                     data_table_bonuses.append({
                         "name": bonus["bonus"].name,
@@ -205,7 +178,7 @@ class Сalculation:
                         "money": money,
                     })
                     continue
-                money = round(calculate_rate / 100 * bonus["bonus"].value, 2)
+                money = percent_of(calculate_rate, bonus["bonus"].value)
                 data_table_bonuses.append({
                     "name": bonus["bonus"].name,
                     "type": "Надбавка %",
@@ -224,7 +197,7 @@ class Сalculation:
                 })
             return data_table_bonuses
 
-        def __call__(self) -> float:
+        def __call__(self) -> int:
             """Calculate bonus money."""
             bonuses = self.calc.bonuses
 
@@ -262,9 +235,6 @@ class Сalculation:
 
         def fetch_data_table_view(self) -> DataTableDict | None:
             """Return rework for view in data table."""
-            start_datetime = self.calc.start_datetime
-            end_datetime = self.calc.end_datetime
-            rate = self.calc.rate
             rework = self.calc.rework
 
             if rework is None:
@@ -272,14 +242,12 @@ class Сalculation:
 
             match rework["type"]:
                 case "percent":
-                    difference = end_datetime - start_datetime
-                    hours = difference.total_seconds() // 60 // 60
-                    rework_hours = hours - rate.hours
-                    money_percent = (rate.value / 100) * rework["value"]
                     return {
                         "name": "Переработка",
-                        "type": "{}%/час".format(rework["value"]),
-                        "money": round(rework_hours * money_percent, 2),
+                        "type": "{}%/час".format(
+                            format_cents(rework["value"]),
+                        ),
+                        "money": self.calc.calculated_rework,
                     }  # type: ignore
                 case "fix":
                     return {
@@ -288,7 +256,7 @@ class Сalculation:
                         "money": rework["value"],
                     }  # type: ignore
 
-        def __call__(self) -> float:
+        def __call__(self) -> int:
             start_datetime = self.calc.start_datetime
             end_datetime = self.calc.end_datetime
             rate = self.calc.rate
@@ -300,10 +268,12 @@ class Сalculation:
             match rework["type"]:
                 case "percent":
                     difference = end_datetime - start_datetime
-                    hours = difference.total_seconds() // 60 // 60
+                    hours = int(difference.total_seconds()) // 60 // 60
                     rework_hours = hours - rate.hours
-                    money_percent = (rate.value / 100) * rework["value"]
-                    money += rework_hours * money_percent
+                    money += percent_of(
+                        rework_hours * rate.value,
+                        rework["value"],
+                    )
                 case "fix":
                     money += rework["value"]
             return money
@@ -319,7 +289,7 @@ class Сalculation:
             self.calc = obj
             return self
 
-        def __call__(self) -> float:
+        def __call__(self) -> int:
             """Calculate money."""
             other_income = self.calc.other_income
             if not other_income:
@@ -343,6 +313,8 @@ class Сalculation:
         end_datetime: datetime,
         rework: TCompleteRework | None = None,
         other_income: list[TCompleteOtherIncome] | None = None,
+        *,
+        calculate: bool = True,
     ) -> None:
         self.core = core
         self.rate = rate
@@ -352,20 +324,92 @@ class Сalculation:
         self.rework = rework
         self.other_income = other_income
 
+        if calculate:
+            self.calculate()
+
+    @classmethod
+    def cached(
+        cls,
+        core: "WorkMaker",
+        rate: "RateRow",
+        bonuses: Iterable[TCompleteBonus],
+        start_datetime: datetime,
+        end_datetime: datetime,
+        rework: TCompleteRework | None = None,
+        other_income: list[TCompleteOtherIncome] | None = None,
+    ) -> Self:
+        """Create calculation obj with components from cache."""
+        bonuses = list(bonuses)
+        calc = cls(
+            core,
+            rate,
+            bonuses,
+            start_datetime,
+            end_datetime,
+            rework,
+            other_income,
+            calculate=False,
+        )
+        calculation_cache = core.core.calculation_cache
+        key = calculation_cache.make_key(
+            rate,
+            bonuses,
+            end_datetime - start_datetime,
+            rework,
+            other_income,
+        )
+        components = calculation_cache.get(key)
+        if components is None:
+            calc.calculate()
+            calculation_cache.put(key, calc.components)
+            return calc
+
+        (
+            calc.calculated_rate,
+            calc.calculated_rework,
+            calc.calculated_bonus,
+            calc.calculated_other,
+        ) = components
+        return calc
+
+    @property
+    def components(self) -> tuple[int, int, int, int]:
+        """Return calculated rate, rework, bonus and other income."""
+        return (
+            self.calculated_rate,
+            self.calculated_rework,
+            self.calculated_bonus,
+            self.calculated_other,
+        )
+
+    def calculate(self) -> None:
+        """Calculate money components."""
         # order is important
         self.calculated_rate = self.rate_calc()
         self.calculated_rework = self.rework_calc()
         self.calculated_bonus = self.bonus_calc()
         self.calculated_other = self.other_calc()
 
-    def result(self) -> float:
+    def breakdown(self) -> list["DataTableDict"]:
+        """Return money components for view in data table."""
+        rows = [
+            self.rate_calc.fetch_data_table_view(),
+            *self.bonus_calc.fetch_data_table_view(),
+        ]
+        rework = self.rework_calc.fetch_data_table_view()
+        if rework:
+            rows.append(rework)
+        for income in self.other_income or ():
+            rows.append({
+                "name": income["name"],
+                "type": "Доп. доход",
+                "money": income["value"],
+            })
+        return rows
+
+    def result(self) -> int:
         """Return completed money value."""
-        return sum((
-            self.calculated_rate,
-            self.calculated_rework,
-            self.calculated_bonus,
-            self.calculated_other,
-        ))
+        return sum(self.components)
 
 
 class WorkMaker(BaseCore):
@@ -375,7 +419,7 @@ class WorkMaker(BaseCore):
 
     def get_rates(self) -> dict[str, "RateRow"]:
         """Get all rates for create view."""
-        rates = self.db.rate.select(state=1)
+        rates = self.core.catalog.rates()
         rates.sort(key=lambda e: -e.by_default)
         return {
             str(rate.id): rate
@@ -384,7 +428,7 @@ class WorkMaker(BaseCore):
 
     def get_bonuses(self) -> list:
         """Get all bonuses for create view."""
-        return self.db.bonus.select(state=1)
+        return self.core.catalog.bonuses()
 
     def get_work_bonuses_info(self, work: "WorkRow"):
         """Return work bonuses info for updating work."""
@@ -398,12 +442,94 @@ class WorkMaker(BaseCore):
         bonuses: Iterable["TCompleteBonus"],
     ) -> None:
         """Save bonuses."""
-        for bonus in bonuses:
-            self.db.work_bonus.add({
+        rows = [
+            {
                 "work_id": work_id,
                 "bonus_id": bonus["bonus"].id,
                 "on_full_sum": bonus["on_full_sum"],
-            })
+            }
+            for bonus in bonuses
+        ]
+        if not rows:
+            return
+        self.db.work_bonus.add(rows)
+
+    def _save_other_income(
+        self,
+        work_id: int,
+        other_income: Iterable[TCompleteOtherIncome] | None,
+    ) -> None:
+        """Save other income in its order."""
+        rows = [
+            (work_id, position, income["name"], income["value"])
+            for position, income in enumerate(other_income or ())
+        ]
+        if not rows:
+            return
+        self.db.execute(
+            "INSERT INTO Other_Income (work_id, position, name, value) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+            many=True,
+        )
+
+    def _update_other_income(
+        self,
+        work_id: int,
+        other_income: Iterable[TCompleteOtherIncome] | None,
+    ) -> None:
+        """Update other income."""
+        self.db.execute(
+            "DELETE FROM Other_Income WHERE work_id = ?",
+            (work_id,),
+        )
+        self._save_other_income(work_id, other_income)
+
+    def get_work_breakdown(self, work: "WorkRow") -> list["DataTableDict"]:
+        """Return saved money components of work."""
+        rows = self.db.execute(
+            "SELECT name, type, money FROM Work_Breakdown "
+            "WHERE work_id = ? ORDER BY position",
+            (work.id,),
+            result=ResultFetch.fetchall,
+        )
+        if rows:
+            return [
+                {"name": name, "type": type_, "money": money}
+                for name, type_, money in rows  # type: ignore
+            ]
+
+        # work was saved before components were stored, they are
+        # calculated by current rates and not saved, it is a read path
+        return Сalculation.from_work(self, work).breakdown()
+
+    def _save_work_breakdown(
+        self,
+        work_id: int,
+        calculation: Сalculation,
+    ) -> None:
+        """Save money components of work."""
+        self.db.execute(
+            "INSERT INTO Work_Breakdown "
+            "(work_id, position, name, type, money) VALUES (?, ?, ?, ?, ?)",
+            [
+                (work_id, position, row["name"], row["type"], row["money"])
+                for position, row in enumerate(calculation.breakdown())
+            ],
+            many=True,
+        )
+
+    def _update_work_breakdown(
+        self,
+        work_id: int,
+        calculation: Сalculation,
+    ) -> None:
+        """Update money components of work."""
+        self.db.execute(
+            "DELETE FROM Work_Breakdown WHERE work_id = ?",
+            (work_id,),
+        )
+        self._save_work_breakdown(work_id, calculation)
 
     def save_work(
         self,
@@ -417,7 +543,8 @@ class WorkMaker(BaseCore):
         other_income: list[TCompleteOtherIncome] | None = None,
     ) -> None:
         """Save new work in db."""
-        work_income = Сalculation(
+        bonuses = list(bonuses)
+        work_income = Сalculation.cached(
             self,
             rate,
             bonuses,
@@ -427,17 +554,6 @@ class WorkMaker(BaseCore):
             other_income,
         )
 
-        rework_id = None
-        if rework:
-            self.db.rework.add(rework)
-            rework_id = self.db.rework.select(
-                columns=["id"],
-                condition="type = '{}' order by id desc limit 1".format(
-                    rework["type"]
-                ),
-            )[0].id
-
-        json_field = {"other_income": other_income}
         work_day = {
             "name": name,
             "description": description,
@@ -446,16 +562,21 @@ class WorkMaker(BaseCore):
             "hours": 0,
             "rate_id": rate.id,
             "value": work_income.result(),
-            "json": json.dumps(json_field),
-            "rework_id": rework_id,
+            "json": "{}",
+            "rework_id": None,
         }
-        self.db.work.add(work_day)
 
-        work: WorkRow = self.db.work.get(**work_day)
-        self._save_work_bonuses(
-            work.id,
-            bonuses,
-        )
+        with self.db.batch():
+            if rework:
+                work_day["rework_id"] = self.db.rework.add(rework)
+            work_id: int = self.db.work.add(work_day)  # type: ignore
+            self._save_work_bonuses(
+                work_id,
+                bonuses,
+            )
+            self._save_other_income(work_id, other_income)
+            self._save_work_breakdown(work_id, work_income)
+        self.core.month_cache.invalidate(start_datetime, end_datetime)
 
     def update_item_by_dict(self, item, updated_dict: dict) -> None:
         """Update item attr."""
@@ -471,17 +592,7 @@ class WorkMaker(BaseCore):
     ) -> None:
         """Update work bonuses."""
         self.db.work_bonus.delete(work_id=work_id)
-        rows = [
-            {
-                "work_id": work_id,
-                "bonus_id": bonus["bonus"].id,
-                "on_full_sum": bonus["on_full_sum"],
-            }
-            for bonus in bonuses
-        ]
-        if not rows:
-            return
-        self.db.work_bonus.add(rows)
+        self._save_work_bonuses(work_id, bonuses)
 
     def update_work(
         self,
@@ -496,7 +607,8 @@ class WorkMaker(BaseCore):
         other_income: list[TCompleteOtherIncome] | None = None,
     ) -> None:
         """Save new work in db."""
-        work_income = Сalculation(
+        bonuses = list(bonuses)
+        work_income = Сalculation.cached(
             self,
             rate,
             bonuses,
@@ -506,25 +618,6 @@ class WorkMaker(BaseCore):
             other_income,
         )
 
-        rework_id = None
-        updating_rework = updating_work.rework
-        if rework:
-            if updating_rework:
-                self.update_item_by_dict(updating_rework, rework)
-                updating_rework.change()
-                rework_id = updating_rework.id
-            else:
-                self.db.rework.add(rework)
-                rework_id = self.db.rework.select(
-                    columns=["id"],
-                    condition="type = '{}' order by id desc limit 1".format(
-                        rework["type"]
-                    ),
-                )[0].id
-        elif not rework and updating_rework:
-            updating_rework.delete()
-
-        json_field = {"other_income": other_income}
         work_day = {
             "name": name,
             "description": description,
@@ -533,15 +626,37 @@ class WorkMaker(BaseCore):
             "hours": 0,
             "rate_id": rate.id,
             "value": work_income.result(),
-            "json": json.dumps(json_field),
-            "rework_id": rework_id,
+            "json": "{}",
+            "rework_id": None,
         }
 
-        # self.update_item_by_dict(updating_work, work_day)
-        self.db.work.update(work_day, id=updating_work.id)
-        updating_work.change()
+        updating_rework = updating_work.rework
+        with self.db.batch():
+            if rework and updating_rework:
+                self.update_item_by_dict(updating_rework, rework)
+                updating_rework.change()
+                work_day["rework_id"] = updating_rework.id
+            elif rework:
+                work_day["rework_id"] = self.db.rework.add(rework)
+
+            # self.update_item_by_dict(updating_work, work_day)
+            self.db.work.update(work_day, id=updating_work.id)
+            updating_work.change()
 
-        self._update_work_bonuses(
-            updating_work.id,
-            bonuses,
+            # delete after work update, work must not refer to it
+            if not rework and updating_rework:
+                updating_rework.delete()
+
+            self._update_work_bonuses(
+                updating_work.id,
+                bonuses,
+            )
+            self._update_other_income(updating_work.id, other_income)
+            self._update_work_breakdown(updating_work.id, work_income)
+        # months of old and new datetimes of work
+        self.core.month_cache.invalidate(
+            updating_work.start_datetime,
+            updating_work.end_datetime,
+            start_datetime,
+            end_datetime,
         )
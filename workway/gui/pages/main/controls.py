@@ -23,8 +23,8 @@ from flet import alignment
 from flet import colors
 from flet import InputBorder
 
-from workway.core.subcores.work import Сalculation
 from workway.gui.pages.common import AlertDialogInfo
+from workway.money import format_cents
 
 from .views import UpdateWorkView
 
@@ -167,63 +167,26 @@ class WorkInfoSheet(BottomSheet):
 
     def _prepare_rows(self) -> list[DataRow]:
         """Prepare rows with data."""
-        calculation = Сalculation.from_work(self.core, self.work)
-
-        data_table_rate = calculation.rate_calc.fetch_data_table_view()
-        rate = DataRow(
-            cells=[
-                DataCell(Text(data_table_rate["name"])),
-                DataCell(Text(data_table_rate["type"])),
-                DataCell(Text(data_table_rate["money"])),
-            ]
-        )
-
-        data_table_bonuses = [
-            DataRow(
-                cells=[
-                    DataCell(Text(bonus["name"])),
-                    DataCell(Text(bonus["type"])),
-                    DataCell(Text(bonus["money"])),
-                ]
-            )
-            for bonus in calculation.bonus_calc.fetch_data_table_view()
-        ]
-
-        data_table_rework = calculation.rework_calc.fetch_data_table_view()
-        if data_table_rework:
-            rework_row = DataRow(
-                cells=[
-                    DataCell(Text(data_table_rework["name"])),
-                    DataCell(Text(data_table_rework["type"])),
-                    DataCell(Text(round(data_table_rework["money"], 2))),
-                ]
-            )
-            data_table_bonuses.append(rework_row)
-
-        other_income = [
+        rows = [
             DataRow(
                 cells=[
-                    DataCell(Text(income["name"])),
-                    DataCell(Text("Доп. доход")),
-                    DataCell(
-                        Text("{}".format(round(income["value"], 2))),
-                    ),
+                    DataCell(Text(row["name"])),
+                    DataCell(Text(row["type"])),
+                    DataCell(Text(format_cents(row["money"]))),
                 ]
             )
-            for income in self.work.other_income
+            for row in self.core.work_maker.get_work_breakdown(self.work)
         ]
 
         work_money = DataRow(
             cells=[
                 DataCell(Text("")),
                 DataCell(Text("Итог")),
-                DataCell(Text(f"{round(self.work.value, 2)}")),
+                DataCell(Text(format_cents(self.work.value))),
             ]
         )
         return [
-            rate,
-            *data_table_bonuses,
-            *other_income,
+            *rows,
             work_money,
         ]
 
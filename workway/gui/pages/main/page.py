@@ -16,6 +16,8 @@ from flet import TextThemeStyle
 from flet import colors
 from flet import dropdown
 
+from workway.money import format_cents
+
 from .controls import WorkTile
 from .views import CreateWorkDayView
 
@@ -27,8 +29,13 @@ if TYPE_CHECKING:
 
 class MainPage(Column):
 
+    # Count of months with kept tiles
+    tiles_months = 12
+
     def __init__(self, main: "Main"):
         self.core = main
+        # tiles are reused while works of month are cached by core
+        self.month_tiles: dict[tuple[str, str], tuple[list, list]] = {}
         today = datetime.now()
         years, months = self.core.filters_data(str(today.year))
 
@@ -85,20 +92,28 @@ class MainPage(Column):
 
     def get_works(self) -> list[WorkTile]:
         """Get works tile list."""
-        works = []
-        month_money_value = 0
-        for work in self.core.get_works(
+        key = (self.dropdown_year.value, self.dropdown_month.value)
+        month = self.core.month_result(
             self.dropdown_month.value,
             self.dropdown_year.value,
-        ):
-            works.append(WorkTile(self.core, work))
-            month_money_value += work.value
-        month_money_value = round(month_money_value, 2)
+        )
+        cached = self.month_tiles.pop(key, None)
+        if cached is None or cached[0] is not month.works:
+            cached = (
+                month.works,
+                [WorkTile(self.core, work) for work in month.works],
+            )
+        self.month_tiles[key] = cached
+        if len(self.month_tiles) > self.tiles_months:
+            del self.month_tiles[next(iter(self.month_tiles))]
+
+        works = list(cached[1])
+        month_money_value = month.total
         bottom_container = Container(
             Column([
                 ListTile(
                     trailing=Text(
-                        f"Итог: {str(month_money_value)} руб.",
+                        f"Итог: {format_cents(month_money_value)} руб.",
                         theme_style=TextThemeStyle.TITLE_LARGE,
                     ),
                 ),
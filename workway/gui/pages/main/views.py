@@ -38,6 +38,8 @@ from flet import icons
 
 from workway.core.db.tables import WorkRow
 from workway.gui.validators import is_number
+from workway.money import format_cents
+from workway.money import to_cents
 
 
 if TYPE_CHECKING:
@@ -65,9 +67,9 @@ class BonusChip(Row):
         super().__init__((
             Chip(
                 label=Text(
-                    f"{bonus.name} +{bonus.value}"
+                    f"{bonus.name} +{format_cents(bonus.value)}"
                     if bonus.type == "fix"
-                    else f"{bonus.name} {bonus.value}%"
+                    else f"{bonus.name} {format_cents(bonus.value)}%"
                 ),
                 on_select=on_select,
                 selected=True if bonus.by_default else False,
@@ -120,9 +122,9 @@ class UpdatedBonusChip(BonusChip):
             (
                 Chip(
                     label=Text(
-                        f"{bonus.name} +{bonus.value}"
+                        f"{bonus.name} +{format_cents(bonus.value)}"
                         if bonus.type == "fix"
-                        else f"{bonus.name} {bonus.value}%"
+                        else f"{bonus.name} {format_cents(bonus.value)}%"
                     ),
                     on_select=on_select,
                     selected=bonus_in_work,
@@ -176,7 +178,7 @@ class UpdateOtherIncome(OtherIncome):
     def __init__(self, other_income: "TCompleteOtherIncome") -> None:
         super().__init__()
         self.name_field.value = other_income["name"]
-        self.money_field.value = str(other_income["value"])
+        self.money_field.value = format_cents(other_income["value"])
 
 
 class CreateWorkDayView(View):
@@ -318,7 +320,7 @@ class CreateWorkDayView(View):
             options=[
                 dropdown.Option(
                     content=Text(
-                        f"{rate.name} +{rate.value} руб."
+                        f"{rate.name} +{rate.pretify_money}"
                     ),
                     key=key,
                 )
@@ -655,7 +657,7 @@ class CreateWorkDayView(View):
 
             if (
                 self.rework_fix_sum.value and
-                self.rework_fix_sum.value.isalpha() is True
+                is_number(self.rework_fix_sum.value) is False
             ):
                 self.rework_fix_sum.error_text = "Сумма должена быть числом"
                 error_flag = False
@@ -671,13 +673,13 @@ class CreateWorkDayView(View):
         if percent:
             return {
                 "type": "percent",
-                "value": int(percent),
+                "value": to_cents(percent),
             }
         fix_sum = self.rework_fix_sum.value
         if fix_sum:
             return {
                 "type": "fix",
-                "value": float(fix_sum),
+                "value": to_cents(fix_sum),
             }
         return None
 
@@ -730,7 +732,7 @@ class CreateWorkDayView(View):
                 "value": value,
             }
             for cont in controls
-            if (value := float(cont.money_field.value or 0)) > 0
+            if (value := to_cents(cont.money_field.value or 0)) > 0
         ]
 
     def save_work(self, event: ControlEvent) -> None:
@@ -803,13 +805,13 @@ class UpdateWorkView(CreateWorkDayView):
             keyboard_type=KeyboardType.NUMBER,
         )
         if work_rework and work_rework.type == "percent":
-            self.rework_percent.value = str(int(work_rework.value))
+            self.rework_percent.value = format_cents(work_rework.value)
         self.rework_fix_sum = TextField(
             label="Фиксированная сумма",
             keyboard_type=KeyboardType.NUMBER,
         )
         if work_rework and work_rework.type == "fix":
-            self.rework_fix_sum.value = str(work_rework.value)
+            self.rework_fix_sum.value = format_cents(work_rework.value)
         self.rework_column = Container(
             content=Column([
                 self.rework_lable,
@@ -907,7 +909,7 @@ class UpdateWorkView(CreateWorkDayView):
             options=[
                 dropdown.Option(
                     content=Text(
-                        f"{rate.name} +{rate.value} руб."
+                        f"{rate.name} +{rate.pretify_money}"
                     ),
                     key=key,
                 )
@@ -20,6 +20,8 @@ from flet import dropdown
 from workway.core.db.tables import BonusType
 from workway.core.db.tables import RateType
 from workway.gui.validators import is_number
+from workway.money import format_cents
+from workway.money import to_cents
 
 
 if TYPE_CHECKING:
@@ -182,7 +184,7 @@ class UpdateRateModal(RateModal):
         self.title = Text("Изменение ставки")
         self.rate_item = rate_item
         self.name.value = rate_item.name
-        self.value.value = str(rate_item.value)
+        self.value.value = format_cents(rate_item.value)
         self.by_default.value = bool(rate_item.by_default)
         self.hours.value = str(rate_item.hours)
         self.type.value = rate_item.type
@@ -206,13 +208,10 @@ class UpdateRateModal(RateModal):
 
         # if value changed create new rate
         if (
-            float(self.rate_item.value) != float(new_rate["value"]) or
+            self.rate_item.value != to_cents(new_rate["value"]) or
             self.type.value != self.rate_item.type
         ):
-            self.rate_item.state = 2
-            self.rate_item.change()
-
-            self.new_rate = self.core.add_rate(new_rate)
+            self.new_rate = self.core.replace_rate(new_rate, self.rate_item)
             self.on_dismiss(self)
             self.close_modal(self)
             return
@@ -330,7 +329,7 @@ class UpdateBonusModal(BonusModal):
         self.bonus_item = bonus_item
         self.name.value = bonus_item.name
         self.type.value = bonus_item.type
-        self.value.value = str(bonus_item.value)
+        self.value.value = format_cents(bonus_item.value)
         self.by_default.value = bool(bonus_item.by_default)
 
     def save_modal(self, event: ControlEvent) -> None:
@@ -350,13 +349,13 @@ class UpdateBonusModal(BonusModal):
 
         # if value changed create new rate
         if (
-            float(self.bonus_item.value) != float(new_bonus["value"]) or
+            self.bonus_item.value != to_cents(new_bonus["value"]) or
             self.type.value != self.bonus_item.type
         ):
-            self.bonus_item.state = 2
-            self.bonus_item.change()
-
-            self.new_bonus = self.core.add_bonus(new_bonus)
+            self.new_bonus = self.core.replace_bonus(
+                new_bonus,
+                self.bonus_item,
+            )
             self.on_dismiss(self)
             self.close_modal(self)
             return
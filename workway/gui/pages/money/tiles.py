@@ -78,7 +78,7 @@ class RateTile(ListTile):
             return
         self.rate = view.new_rate
         self.title.value = self.rate.name
-        self.subtitle.value = self.rate.value
+        self.subtitle.value = self.rate.pretify_money
         self.update()
 
     def open_update_view(self, event: ControlEvent) -> None:
@@ -138,9 +138,8 @@ class BonusTile(ListTile):
         )
 
     def delete(self, event: ControlEvent) -> None:
-        """Delete rate from db and gui."""
-        self.bonus.state = 2
-        self.bonus.change()
+        """Delete bonus from db and gui."""
+        self.core.delete_bonus(self.bonus.id)
         self.parent.controls.remove(self)
         self.parent.update()
 
@@ -150,7 +149,7 @@ class BonusTile(ListTile):
             return
         self.bonus = view.new_bonus
         self.title.value = self.bonus.name
-        self.subtitle.value = self.bonus.value
+        self.subtitle.value = self.bonus.pretify_money
         self.update()
 
     def open_update_view(self, event: ControlEvent) -> None:
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 from flet import Column
 from flet import Container
+from flet import Dropdown
 from flet import ElevatedButton
 from flet import FilePicker
 from flet import FilePickerResultEvent
@@ -18,10 +19,15 @@ from flet import RadioGroup
 from flet import Row
 from flet import Switch
 from flet import Text
+from flet import TextField
 from flet import TextThemeStyle
 from flet import ThemeMode
+from flet import dropdown
 from flet import icons
 
+from workway.core.db.profiles import ProfileName
+from workway.gui.validators import is_number
+
 from .common import AlertDialogInfo
 from .common import ContainerWithBorder
 
@@ -50,6 +56,43 @@ class SettingPage(Container):
             value=core.current_theme,
         )
 
+        self.profile_radio_group = RadioGroup(
+            content=Column([
+                Radio(value=profile.name, label=profile.value)
+                for profile in ProfileName
+            ]),  # type: ignore
+            on_change=self.change_db_profile,
+            value=core.db_profile,
+        )
+
+        self.recalc_workers_dropdown = Dropdown(
+            label="Процессов для пересчёта",
+            options=[
+                dropdown.Option(
+                    key=str(workers),
+                    content=Text(str(workers)),
+                )
+                for workers in range(1, core.max_recalc_workers + 1)
+            ],
+            value=str(core.recalc_workers),
+            on_change=self.change_recalc_workers,
+            disabled=core.max_recalc_workers == 1,
+        )
+
+        self.slow_query_field = TextField(
+            label="Медленный запрос, мс",
+            value=format(core.slow_query_ms, "g"),
+            on_blur=self.change_slow_query_ms,
+            on_submit=self.change_slow_query_ms,
+        )
+        self.trace_queries_switch = Switch(
+            label="Искать вызов запросов (медленнее)",
+            value=core.trace_queries,
+            on_change=self.change_trace_queries,
+        )
+        self.query_stats_column = Column([])
+        self.fill_query_stats()
+
         super().__init__(
             content=Column([
                 Container(
@@ -66,6 +109,14 @@ class SettingPage(Container):
                     ),
                     self.theme_radio_group,
                 ]),
+                ContainerWithBorder([
+                    Text(
+                        "Режим работы базы данных",
+                        theme_style=TextThemeStyle.TITLE_MEDIUM,
+                    ),
+                    self.profile_radio_group,
+                    self.recalc_workers_dropdown,
+                ]),
                 ContainerWithBorder([
                     Text(
                         "Импорт / Экспорт базы данных",
@@ -88,6 +139,32 @@ class SettingPage(Container):
                         ),
                     ),
                 ]),
+                ContainerWithBorder([
+                    Text(
+                        "Отладка запросов",
+                        theme_style=TextThemeStyle.TITLE_MEDIUM,
+                    ),
+                    self.slow_query_field,
+                    self.trace_queries_switch,
+                    Row([
+                        ElevatedButton(
+                            icon=icons.REFRESH,
+                            text="Обновить",
+                            on_click=self.refresh_query_stats,
+                        ),
+                        ElevatedButton(
+                            icon=icons.CLEAR_ALL,
+                            text="Сбросить",
+                            on_click=self.reset_query_stats,
+                        ),
+                        ElevatedButton(
+                            icon=icons.SAVE_ALT,
+                            text="Сохранить в JSON",
+                            on_click=self.dump_query_stats,
+                        ),
+                    ]),
+                    self.query_stats_column,
+                ]),
             ]),
             padding=Padding(left=15, top=10, right=15, bottom=10),
         )
@@ -104,6 +181,106 @@ class SettingPage(Container):
                 self.core.set_theme("light")
         self.page.update()
 
+    def change_db_profile(self, event: "ControlEvent") -> None:
+        """Change db performance profile."""
+        control: RadioGroup = event.control
+        try:
+            self.core.set_db_profile(control.value)
+        except Exception:
+            self.page.open(AlertDialogInfo("Ошибка", "Что-то пошло не так"))
+            control.value = self.core.db_profile
+        self.page.update()
+
+    def change_recalc_workers(self, event: "ControlEvent") -> None:
+        """Change count of processes for recalculation of works."""
+        control: Dropdown = event.control
+        self.core.set_recalc_workers(int(control.value))
+        self.page.update()
+
+    def change_slow_query_ms(self, event: "ControlEvent") -> None:
+        """Change threshold of slow query."""
+        control: TextField = event.control
+        if is_number(control.value):
+            self.core.set_slow_query_ms(float(control.value))  # type: ignore
+        else:
+            control.value = format(self.core.slow_query_ms, "g")
+        self.page.update()
+
+    def change_trace_queries(self, event: "ControlEvent") -> None:
+        """Enable or disable tracing of queries."""
+        control: Switch = event.control
+        self.core.set_trace_queries(bool(control.value))
+        self.page.update()
+
+    def fill_query_stats(self, limit: int = 10) -> None:
+        """Show queries with the biggest total time."""
+        all_stats = self.core.query_stats()
+        stats = all_stats["queries"]
+        identity = all_stats["identity"]
+        statements = all_stats["statements"]
+        controls = [
+            Text(
+                "Объекты из памяти: {}, из базы: {}".format(
+                    identity["hits"],
+                    identity["misses"],
+                ),
+                theme_style=TextThemeStyle.LABEL_LARGE,
+            ),
+            Text(
+                "Компиляций запросов (оценка): {}, из кэша: {}".format(
+                    statements["prepared"],
+                    statements["reused"],
+                ),
+                theme_style=TextThemeStyle.LABEL_LARGE,
+            ),
+        ]
+        for query, record in list(stats["queries"].items())[:limit]:
+            caller = next(iter(record["callers"]), "")
+            controls.append(Text(
+                "{} раз, всего {:.1f} мс, p50 {:.2f} мс, p99 {:.2f} мс, "
+                "строк {}, {}".format(
+                    record["count"],
+                    record["total_ms"],
+                    record["p50_ms"],
+                    record["p99_ms"],
+                    record["rows"],
+                    caller,
+                ),
+                theme_style=TextThemeStyle.LABEL_LARGE,
+            ))
+            controls.append(Text(
+                query,
+                theme_style=TextThemeStyle.BODY_SMALL,
+                max_lines=3,
+                selectable=True,
+            ))
+        if stats["slow"]:
+            controls.append(Text(
+                "Медленных запросов: {}".format(len(stats["slow"])),
+                theme_style=TextThemeStyle.LABEL_LARGE,
+            ))
+        self.query_stats_column.controls = controls
+
+    def refresh_query_stats(self, event: "ControlEvent") -> None:
+        """Show current statistics of queries."""
+        self.fill_query_stats()
+        self.page.update()
+
+    def reset_query_stats(self, event: "ControlEvent") -> None:
+        """Reset statistics of queries."""
+        self.core.reset_query_stats()
+        self.fill_query_stats()
+        self.page.update()
+
+    def dump_query_stats(self, event: "ControlEvent") -> None:
+        """Save statistics of queries to json file near db."""
+        try:
+            path = self.core.dump_query_stats()
+        except Exception:
+            self.page.open(AlertDialogInfo("Ошибка", "Что-то пошло не так"))
+            return
+        self.page.open(AlertDialogInfo("Статистика сохранена", str(path)))
+
     @property
     def file_picker_save(self) -> "FilePicker":
         """Create file picker and return it."""
@@ -139,6 +316,7 @@ class SettingPage(Container):
         save_path: Path = self.core.db.normalize_path(Path(event.path))
 
         try:
+            self.core.checkpoint_db()
             archive_path = shutil.make_archive(
                 self.get_archive_name(save_path),
                 "zip",
@@ -155,6 +333,9 @@ class SettingPage(Container):
             return
         db_path = self.core.db.normalize_path(self.core.db_path)
         db_path.unlink()
+        # WAL files of old db must not be applied to uploaded db
+        for suffix in ("-wal", "-shm"):
+            db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
         try:
             shutil.unpack_archive(event.files[0].path, str(db_path.parent))
         except Exception:
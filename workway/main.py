@@ -34,4 +34,14 @@ def main(page: Page) -> None:
     page.on_view_pop = view_pop
 
 
-app(main, assets_dir="assets")
+def run() -> None:
+    """Start app.
+
+    It is not called on import, worker processes of recalculation
+    import main module of app again.
+    """
+    app(main, assets_dir="assets")
+
+
+if __name__ == "__main__":
+    run()
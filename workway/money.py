@@ -0,0 +1,41 @@
+"""Module contain integer money helpers.
+
+Money is stored and calculated in cents and percents are stored in
+hundredths of percent, so both are integer hundredths of user value.
+"""
+from decimal import ROUND_HALF_UP
+from decimal import Decimal
+
+
+__all__ = (
+    "CENTS",
+    "format_cents",
+    "percent_of",
+    "to_cents",
+)
+
+
+CENTS = 100
+
+
+def to_cents(value: str | int | float) -> int:
+    """Convert user value to integer hundredths."""
+    hundredths = Decimal(str(value).strip().replace(",", ".")) * CENTS
+    return int(hundredths.to_integral_value(ROUND_HALF_UP))
+
+
+def format_cents(value: int) -> str:
+    """Format hundredths like user value, zero cents are dropped."""
+    sign = "-" if value < 0 else ""
+    total, cent = divmod(abs(value), CENTS)
+    if not cent:
+        return f"{sign}{total}"
+    return f"{sign}{total}.{cent:02d}"
+
+
+def percent_of(value: int, percent: int) -> int:
+    """Return percent of cents, percent is in hundredths.
+
+    Half of cent is rounded up.
+    """
+    return (value * percent * 2 + CENTS * CENTS) // (2 * CENTS * CENTS)
@@ -17,7 +17,7 @@ class TCompleteBonus(TypedDict):
 class TCompleteRework(TypedDict):
     """Completed bonus dict for core."""
 
-    value: float
+    value: int
     type: Literal["percent", "fix"]
 
 
@@ -25,7 +25,7 @@ class TCompleteOtherIncome(TypedDict):
     """Completed other income dict for core."""
 
     name: str
-    value: float
+    value: int
 
 
 class DataTableDict(TypedDict):